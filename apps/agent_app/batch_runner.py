@@ -0,0 +1,246 @@
+"""
+Offline batch runner: pushes a JSONL file of shipment requests through the
+compiled workflow, one thread per record.
+
+Input line:  {"message": "...", "id": "optional", "thread_id": "optional", "quote_id": "optional"}
+Output line: {"line": N, "id": ..., "thread_id": ..., "status": ..., "response": ..., ...}
+
+Usage (from project root):
+    uv run python -m apps.agent_app.batch_runner --input in.jsonl --output out.jsonl --workers 8 --auto-approve
+
+Resume: thread IDs are deterministic (input file stem + record id/line), so a
+re-run skips records already in the output file and continues half-finished
+threads from their last checkpoint instead of replaying the message.
+"""
+
+import asyncio
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Set
+from dotenv import load_dotenv, find_dotenv
+from psycopg_pool import AsyncConnectionPool
+from shared_core.logger.logging import logger
+
+# --- IMPORTS ---
+from agenticAI_full_workflow.agent.graph_registry import GraphRegistry
+from agenticAI_full_workflow.utils.http_client import aclose_http_client
+from agenticAI_full_workflow.utils.checkpoint_serde import build_checkpointer
+from agenticAI_full_workflow.utils.mcp_pool import start_quote_mcp_pool, set_quote_mcp_pool
+from agenticAI_full_workflow.utils.llm_cache import attach_postgres_llm_cache, detach_postgres_llm_cache
+from agenticAI_full_workflow.utils.submission_ledger import start_submission_ledger, set_submission_ledger
+
+# Load .env
+load_dotenv(find_dotenv(), override=True)
+
+# Fix for psycopg/asyncio on Windows
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+def thread_id_for(record: Dict[str, Any], line_no: int, input_path: Path) -> str:
+    if record.get("thread_id"):
+        return str(record["thread_id"])
+    return f"batch_{input_path.stem}_{record.get('id', line_no)}"
+
+def load_completed_threads(output_path: Path) -> Set[str]:
+    done = set()
+    if not output_path.exists():
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from a crash
+            if row.get("thread_id") and row.get("status") != "error":
+                done.add(row["thread_id"])
+    return done
+
+class JsonlWriter:
+    """Appends one JSON object per line and flushes, so a crash loses at most the in-flight rows."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = asyncio.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    async def write(self, row: Dict[str, Any]):
+        line = json.dumps(row, default=str) + "\n"
+        async with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class BatchRunner:
+    def __init__(self, graph, writer: JsonlWriter, auto_approve: bool = False):
+        self.graph = graph
+        self.writer = writer
+        self.auto_approve = auto_approve
+        self.counts = {"submitted": 0, "submit_failed": 0, "needs_review": 0, "needs_input": 0, "error": 0, "skipped": 0}
+
+    async def _drive(self, record: Dict[str, Any], config: Dict[str, Any]):
+        snapshot = await self.graph.aget_state(config)
+
+        if not snapshot.created_at:
+            initial_data = {"key": record["quote_id"]} if record.get("quote_id") else {}
+            await self.graph.ainvoke({
+                "messages": [("user", record["message"])],
+                "is_approved": False,
+                "extracted_data": initial_data
+            }, config)
+        elif snapshot.next and "Review_Gate" not in snapshot.next:
+            # Crashed mid-run last time: continue from the checkpoint, don't replay the message
+            logger.info(f"[Thread: {config['configurable']['thread_id']}] Resuming from {snapshot.next}")
+            await self.graph.ainvoke(None, config)
+
+        snapshot = await self.graph.aget_state(config)
+        if self.auto_approve and snapshot.next and "Review_Gate" in snapshot.next:
+            await self.graph.aupdate_state(config, {"is_approved": True})
+            await self.graph.ainvoke(None, config)
+            snapshot = await self.graph.aget_state(config)
+        return snapshot
+
+    async def process(self, line_no: int, record: Dict[str, Any], thread_id: str):
+        config = {"configurable": {"thread_id": thread_id}}
+        start = time.perf_counter()
+        row = {"line": line_no, "id": record.get("id"), "thread_id": thread_id}
+        try:
+            if not record.get("message"):
+                raise ValueError("Record has no 'message'.")
+
+            snapshot = await self._drive(record, config)
+            values = snapshot.values
+            messages = values.get("messages", [])
+            last_content = str(messages[-1].content) if messages else ""
+
+            if snapshot.next and "Review_Gate" in snapshot.next:
+                # A failed submission re-arms the Review_Gate; the next approval retries it
+                status = "submit_failed" if values.get("submission_failed") else "needs_review"
+            elif values.get("missing_fields"):
+                status = "needs_input"
+            else:
+                status = "submitted"
+
+            row.update({
+                "status": status,
+                "response": last_content,
+                "extracted_data": values.get("extracted_data"),
+                "missing_fields": values.get("missing_fields", []),
+            })
+        except Exception as e:
+            logger.error(f"[Thread: {thread_id}] Batch record failed: {e}")
+            status = "error"
+            row.update({"status": status, "error": str(e)})
+
+        row["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self.counts[status] += 1
+        await self.writer.write(row)
+
+async def _worker(runner: BatchRunner, queue: asyncio.Queue):
+    while True:
+        item = await queue.get()
+        try:
+            if item is None:
+                return
+            await runner.process(*item)
+        finally:
+            queue.task_done()
+
+async def run_batch(input_path: Path, output_path: Path, workers: int, auto_approve: bool, resume: bool):
+    postgres_url = os.getenv("POSTGRES_URL")
+    if not postgres_url:
+        raise SystemExit("[ERROR]: POSTGRES_URL not found in .env")
+
+    completed = load_completed_threads(output_path) if resume else set()
+    if completed:
+        print(f"[RESUME]: {len(completed)} threads already in {output_path}, skipping them.")
+
+    pool = AsyncConnectionPool(conninfo=postgres_url, max_size=workers + 2, kwargs={"autocommit": True}, open=False)
+    await pool.open()
+    mcp_pool = None
+    writer = JsonlWriter(output_path)
+    try:
+        checkpointer = build_checkpointer(pool)
+        await checkpointer.setup()
+        registry = GraphRegistry(checkpointer=checkpointer)
+        graph = await registry.load()
+        # Reprocessing a batch reuses LLM responses from earlier runs
+        await attach_postgres_llm_cache(pool)
+
+        if auto_approve:
+            mcp_pool = await start_quote_mcp_pool(size=min(workers, 4))
+            # Re-runs/resumes never price the same payload twice
+            await start_submission_ledger(pool)
+
+        runner = BatchRunner(graph, writer, auto_approve=auto_approve)
+        # Bounded queue: the input file is streamed, never loaded whole
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        tasks = [asyncio.create_task(_worker(runner, queue)) for _ in range(workers)]
+
+        started = time.perf_counter()
+        first_line: Dict[str, int] = {}
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await writer.write({"line": line_no, "status": "error", "error": f"Invalid JSON: {e}"})
+                    runner.counts["error"] += 1
+                    continue
+                if not isinstance(record, dict):
+                    await writer.write({"line": line_no, "status": "error", "error": "Record must be a JSON object."})
+                    runner.counts["error"] += 1
+                    continue
+                thread_id = thread_id_for(record, line_no, input_path)
+                if thread_id in first_line:
+                    # Two records on one thread would interleave their checkpoints
+                    await writer.write({
+                        "line": line_no, "thread_id": thread_id, "status": "error",
+                        "error": f"Duplicate thread_id (already used on line {first_line[thread_id]}).",
+                    })
+                    runner.counts["error"] += 1
+                    continue
+                first_line[thread_id] = line_no
+                if thread_id in completed:
+                    runner.counts["skipped"] += 1
+                    continue
+                await queue.put((line_no, record, thread_id))
+
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+
+        elapsed = time.perf_counter() - started
+        print(f"\n[DONE]: {json.dumps(runner.counts)} in {elapsed:.1f}s -> {output_path}")
+    finally:
+        writer.close()
+        set_submission_ledger(None)
+        detach_postgres_llm_cache()
+        if mcp_pool:
+            set_quote_mcp_pool(None)
+            await mcp_pool.close()
+        await aclose_http_client()
+        await pool.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSONL file of shipment requests through the agent workflow.")
+    parser.add_argument("--input", required=True, type=Path, help="Input JSONL (one request per line)")
+    parser.add_argument("--output", required=True, type=Path, help="Output JSONL (appended incrementally)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent threads in flight")
+    parser.add_argument("--auto-approve", action="store_true", help="Approve at Review_Gate and submit for pricing")
+    parser.add_argument("--no-resume", action="store_true", help="Do not skip threads already in the output file")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(run_batch(args.input, args.output, max(1, args.workers), args.auto_approve, not args.no_resume))
+    except KeyboardInterrupt:
+        print("\n\n[SYSTEM]: Batch interrupted. Re-run the same command to resume.")
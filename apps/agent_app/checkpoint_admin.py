@@ -0,0 +1,136 @@
+"""
+Checkpoint maintenance CLI (Postgres).
+
+Usage (from project root):
+    uv run python -m apps.agent_app.checkpoint_admin migrate [--batch-size 500]
+    uv run python -m apps.agent_app.checkpoint_admin train-dict --output config/checkpoints.zdict [--samples 2000]
+    uv run python -m apps.agent_app.checkpoint_admin prune [--compact-after 86400] [--thread-ttl 2592000] [--max-batches 1000]
+
+migrate     Re-encodes rows written by the stock serializer, or with a previous
+            zstd dictionary, with the compact one (compression + form_schema
+            dedupe). Idempotent, resumable.
+train-dict  Trains a zstd dictionary from existing checkpoint values. Point
+            `checkpoint_serde.zstd_dictionary` at the file to use it and move the
+            old path to `previous_zstd_dictionaries`; it can be dropped once
+            `migrate` has re-encoded the rows written with it.
+prune       Runs the checkpoint retention job once (same as the API's scheduled
+            task): keeps only the latest checkpoint of older threads and deletes
+            threads idle past the TTL, in bounded batches.
+"""
+
+import asyncio
+import argparse
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv, find_dotenv
+from psycopg_pool import AsyncConnectionPool
+
+# --- IMPORTS ---
+from agenticAI_full_workflow.utils.checkpoint_retention import build_checkpoint_retention, CheckpointRetention
+from agenticAI_full_workflow.utils.checkpoint_serde import (
+    CompactPostgresSaver,
+    SCHEMA_REF_TYPE,
+    build_checkpointer,
+    migrate_checkpoints,
+    train_zstd_dictionary,
+)
+
+# Load .env
+load_dotenv(find_dotenv(), override=True)
+
+# Fix for psycopg/asyncio on Windows
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+async def _open_saver(postgres_url: str):
+    pool = AsyncConnectionPool(conninfo=postgres_url, max_size=2, kwargs={"autocommit": True}, open=False)
+    await pool.open()
+    saver = build_checkpointer(pool)
+    await saver.setup()
+    return pool, saver
+
+def _require_compact(saver) -> CompactPostgresSaver:
+    if not isinstance(saver, CompactPostgresSaver):
+        raise SystemExit("[ERROR]: checkpoint_serde is disabled in config.yaml")
+    return saver
+
+async def run_migrate(saver: CompactPostgresSaver, batch_size: int):
+    counts = await migrate_checkpoints(saver, batch_size=batch_size)
+    print(f"[DONE]: Migrated rows: {counts}")
+
+async def run_train_dict(saver: CompactPostgresSaver, output: Path, samples: int, dict_size: int):
+    async with saver._cursor() as cur:
+        await cur.execute(
+            "SELECT type, blob FROM checkpoint_blobs WHERE blob IS NOT NULL AND type <> %s ORDER BY random() LIMIT %s",
+            (SCHEMA_REF_TYPE, samples),
+        )
+        rows = await cur.fetchall()
+
+    raw = []
+    for row in rows:
+        typ, blob = row["type"], row["blob"]
+        if "+" in typ:
+            typ, codec = typ.rsplit("+", 1)
+            blob = saver.serde.decompress(codec, blob)
+        raw.append(blob)
+    if len(raw) < 10:
+        raise SystemExit(f"[ERROR]: Only {len(raw)} samples found; run some conversations first.")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(train_zstd_dictionary(raw, dict_size=dict_size))
+    print(f"[DONE]: Trained dictionary from {len(raw)} samples -> {output}")
+
+async def run_prune(pool, args):
+    retention = build_checkpoint_retention(pool) or CheckpointRetention(pool)
+    if args.compact_after is not None:
+        retention.compact_after_seconds = args.compact_after
+    if args.thread_ttl is not None:
+        retention.thread_ttl_seconds = args.thread_ttl
+    if args.max_batches is not None:
+        retention.max_batches_per_run = args.max_batches
+    report = await retention.run_once()
+    if report.skipped:
+        raise SystemExit("[ERROR]: Another process is running checkpoint retention.")
+    print(f"[DONE]: {report}")
+
+async def main(args):
+    postgres_url = os.getenv("POSTGRES_URL")
+    if not postgres_url:
+        raise SystemExit("[ERROR]: POSTGRES_URL not found in .env")
+
+    pool, saver = await _open_saver(postgres_url)
+    try:
+        if args.command == "migrate":
+            await run_migrate(_require_compact(saver), args.batch_size)
+        elif args.command == "train-dict":
+            await run_train_dict(_require_compact(saver), args.output, args.samples, args.dict_size)
+        elif args.command == "prune":
+            await run_prune(pool, args)
+    finally:
+        await pool.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Checkpoint maintenance for the agent workflow.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="Re-encode legacy checkpoint rows with the compact serializer")
+    migrate.add_argument("--batch-size", type=int, default=500)
+
+    train = sub.add_parser("train-dict", help="Train a zstd dictionary from stored checkpoints")
+    train.add_argument("--output", required=True, type=Path)
+    train.add_argument("--samples", type=int, default=2000)
+    train.add_argument("--dict-size", type=int, default=112640, help="Dictionary size in bytes")
+
+    prune = sub.add_parser("prune", help="Compact old threads and delete idle ones (bounded batches)")
+    prune.add_argument("--compact-after", type=float, default=None, help="Seconds; overrides config")
+    prune.add_argument("--thread-ttl", type=float, default=None, help="Seconds; overrides config (0 disables)")
+    prune.add_argument("--max-batches", type=int, default=None, help="Overrides config")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\n\n[SYSTEM]: Interrupted. Re-run the same command to continue.")
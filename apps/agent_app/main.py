@@ -1,12 +1,14 @@
 import asyncio
+import hashlib
+import json
 import os
 import sys
 import time
 from typing import List, Optional, Any, Dict
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from dotenv import load_dotenv, find_dotenv
-from fastapi import FastAPI, HTTPException, Request, Depends, Security
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Depends, Security, Header
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -14,8 +16,31 @@ from psycopg_pool import AsyncConnectionPool
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
 # --- IMPORTS ---
-from agenticAI_full_workflow.agent.agent_workflow import AgentWorkflowBuilder
-from shared_core.logger.logging import logger
+from agenticAI_full_workflow.agent.graph_registry import GraphRegistry
+from agenticAI_full_workflow.utils.http_client import aclose_http_client
+from agenticAI_full_workflow.utils.mcp_pool import MCPSessionPool, start_quote_mcp_pool, set_quote_mcp_pool
+from agenticAI_full_workflow.utils.checkpoint_serde import build_checkpointer
+from agenticAI_full_workflow.utils.checkpoint_retention import build_checkpoint_retention
+from agenticAI_full_workflow.utils.snapshot_cache import thread_snapshot_cache
+from agenticAI_full_workflow.utils.llm_cache import attach_postgres_llm_cache, detach_postgres_llm_cache
+from agenticAI_full_workflow.project_nodes.submitter_node import quote_message
+from agenticAI_full_workflow.project_nodes.agent_node import router as extraction_router
+from agenticAI_full_workflow.schemas.form_schema import form_model_cache
+from agenticAI_full_workflow.schemas.validation_plan import validation_plan_cache
+from agenticAI_full_workflow.utils.schema_cache import schema_cache
+from agenticAI_full_workflow.utils.llm_cache import llm_response_cache
+from agenticAI_full_workflow.utils.metrics import MetricFamily, metrics, pool_families, cache_families
+from agenticAI_full_workflow.utils.tracing import SERVER, tracer
+from agenticAI_full_workflow.utils.submission_ledger import SubmissionLedger, start_submission_ledger, set_submission_ledger
+from agenticAI_full_workflow.utils.thread_locks import (
+    RequestIdReusedError,
+    ThreadBusyError,
+    ThreadLockManager,
+    new_thread_id,
+    request_coalescer,
+    thread_lock_settings,
+)
+from shared_core.logger.logging import logger, bind_log_context
 from shared_core.exception.exceptionhandling import CustomException
 
 # --- CONFIG ---
@@ -35,6 +60,13 @@ if not API_KEY:
 class ServiceState:
     pool: Optional[AsyncConnectionPool] = None
     checkpointer: Optional[AsyncPostgresSaver] = None
+    graph_registry: Optional[GraphRegistry] = None
+    mcp_pool: Optional[MCPSessionPool] = None
+    retention_task: Optional[asyncio.Task] = None
+    # In-process locks by default; lifespan adds Postgres advisory locks if configured
+    thread_locks: ThreadLockManager = ThreadLockManager()
+    lock_pool: Optional[AsyncConnectionPool] = None
+    submission_ledger: Optional[SubmissionLedger] = None
 
 service_state = ServiceState()
 
@@ -56,9 +88,46 @@ async def lifespan(app: FastAPI):
         await service_state.pool.open()
         logger.info("Database Connection Pool Created.")
 
-        service_state.checkpointer = AsyncPostgresSaver(service_state.pool)
+        # Compact serializer (compressed values, form_schema stored once); see config.yaml
+        service_state.checkpointer = build_checkpointer(service_state.pool)
         await service_state.checkpointer.setup()
         logger.info("Checkpointer Initialized.")
+
+        # Compile the workflow ONCE per process, bound to the shared checkpointer
+        service_state.graph_registry = GraphRegistry(checkpointer=service_state.checkpointer)
+        await service_state.graph_registry.load()
+        logger.info(f"Workflow Graph Ready (version={service_state.graph_registry.active_version}).")
+
+        # Long-lived Quote MCP sessions (borrowed by Submitter on /approve)
+        service_state.mcp_pool = await start_quote_mcp_pool()
+
+        # Shared tier of the LLM response cache (the memory tier exists from import time)
+        await attach_postgres_llm_cache(service_state.pool)
+
+        # Idempotent submissions: one GetPrice call per (thread, payload)
+        service_state.submission_ledger = await start_submission_ledger(service_state.pool)
+
+        # Per-thread serialization across workers/replicas (dedicated small pool)
+        lock_settings = thread_lock_settings()
+        if lock_settings.get("advisory_locks", False):
+            service_state.lock_pool = AsyncConnectionPool(
+                conninfo=POSTGRES_URL,
+                min_size=1,
+                max_size=int(lock_settings.get("advisory_pool_size", 10)),
+                kwargs={"autocommit": True},
+                open=False
+            )
+            await service_state.lock_pool.open()
+        service_state.thread_locks = ThreadLockManager(
+            advisory_pool=service_state.lock_pool,
+            acquire_timeout=float(lock_settings.get("acquire_timeout_seconds", 120)),
+        )
+        logger.info(f"Thread Locks Ready (advisory={service_state.lock_pool is not None}).")
+
+        # Scheduled checkpoint compaction / TTL purge (advisory-locked across replicas)
+        retention = build_checkpoint_retention(service_state.pool)
+        if retention:
+            service_state.retention_task = asyncio.create_task(retention.run_forever(), name="checkpoint-retention")
         
         yield
         
@@ -67,6 +136,18 @@ async def lifespan(app: FastAPI):
         sys.exit(1)
     finally:
         logger.info("Shutting down...")
+        if service_state.retention_task:
+            service_state.retention_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await service_state.retention_task
+        set_submission_ledger(None)
+        detach_postgres_llm_cache()
+        if service_state.mcp_pool:
+            set_quote_mcp_pool(None)
+            await service_state.mcp_pool.close()
+        await aclose_http_client()
+        if service_state.lock_pool:
+            await service_state.lock_pool.close()
         if service_state.pool:
             await service_state.pool.close()
             logger.info("Database Pool Closed.")
@@ -91,16 +172,27 @@ app.add_middleware(
 async def log_requests(request: Request, call_next):
     start_time = time.time()
     request_id = request.headers.get("X-Request-ID", str(int(time.time()*1000)))
+    bind_log_context(request_id=request_id)
     logger.info(f"[Req:{request_id}] {request.method} {request.url.path}")
-    try:
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-        logger.info(f"[Req:{request_id}] {response.status_code} ({process_time:.2f}ms)")
-        return response
-    except Exception as e:
-        process_time = (time.time() - start_time) * 1000
-        logger.error(f"[Req:{request_id}] FAILED ({process_time:.2f}ms): {e}")
-        raise e
+    # Root span of the request (child of the caller's span when a traceparent header is sent)
+    with tracer.span(
+        f"{request.method} {request.url.path}",
+        SERVER,
+        {"http.request.method": request.method, "url.path": request.url.path, "request_id": request_id},
+        traceparent=request.headers.get("traceparent"),
+    ) as span:
+        try:
+            response = await call_next(request)
+            process_time = (time.time() - start_time) * 1000
+            logger.info(f"[Req:{request_id}] {response.status_code} ({process_time:.2f}ms)")
+            if span is not None:
+                span.set("http.response.status_code", response.status_code)
+                response.headers["traceparent"] = span.traceparent
+            return response
+        except Exception as e:
+            process_time = (time.time() - start_time) * 1000
+            logger.error(f"[Req:{request_id}] FAILED ({process_time:.2f}ms): {e}")
+            raise e
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -141,88 +233,240 @@ class ChatResponse(BaseModel):
     extracted_data: Optional[Dict[str, Any]] = None
     is_paused: bool = False
     missing_fields: Optional[List[str]] = None
+    # Machine-readable issues: {"code", "message", "field", "item"}
+    validation_issues: Optional[List[Dict[str, Any]]] = None
 
 # --- HELPERS ---
-async def build_graph_for_request(checkpointer: AsyncPostgresSaver):
-    builder = AgentWorkflowBuilder()
-    graph = await builder.build(checkpointer=checkpointer)
-    return graph
+def get_graph():
+    # Compiled once in lifespan; safe to share across concurrent requests
+    return service_state.graph_registry.get()
+
+async def _thread_state(graph, config, thread_id: str, fresh: bool = False):
+    """
+    (exists, next_nodes) from the hot-thread cache; one checkpoint read on a miss.
+    The cache is per process, so writes from other workers (or retention) do not
+    invalidate it: `fresh=True` always reads the checkpoint, for decisions that
+    must not rest on a stale entry.
+    """
+    cached = None if fresh else thread_snapshot_cache.get(thread_id)
+    if cached is not None:
+        return True, cached.next
+    snapshot = await graph.aget_state(config)
+    if not snapshot.created_at:
+        return False, ()
+    thread_snapshot_cache.put(thread_id, snapshot.values, snapshot.next)
+    return True, snapshot.next
+
+async def _build_chat_payload(graph, config, request: ChatRequest, thread_id: str) -> Dict[str, Any]:
+    # A quote_id is only injected into a NEW thread: check existence for real
+    exists, next_nodes = await _thread_state(graph, config, thread_id, fresh=bool(request.quote_id))
+    
+    # Handle Silent ID Injection
+    if not exists:
+        msg = ("user", request.message)
+        initial_data = {}
+        if request.quote_id:
+            logger.info(f"[Thread: {thread_id}] Injecting Silent Quote ID: {request.quote_id}")
+            initial_data["key"] = request.quote_id 
+
+        return {
+            "messages": [msg], 
+            "is_approved": False,
+            "extracted_data": initial_data 
+        }
+
+    # Resume logic
+    if next_nodes and "Review_Gate" in next_nodes:
+        return {"messages": [("user", request.message)], "is_approved": False}
+    return {"messages": [("user", request.message)]}
+
+async def _run_graph(graph, payload, config, thread_id: str):
+    """
+    Runs the graph and returns (final values, next nodes) without re-reading the checkpoint.
+    The only interrupt is `interrupt_before=["Review_Gate"]`, reported as an `__interrupt__` update.
+    """
+    thread_snapshot_cache.invalidate(thread_id)
+    values, paused = None, False
+    async for mode, chunk in graph.astream(payload, config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            values = chunk
+        elif "__interrupt__" in chunk:
+            paused = True
+
+    next_nodes = ("Review_Gate",) if paused else ()
+    if values is None:
+        # Nothing ran (e.g. resume of a finished thread): fall back to one read
+        snapshot = await graph.aget_state(config)
+        values, next_nodes = snapshot.values, snapshot.next
+    thread_snapshot_cache.put(thread_id, values, next_nodes)
+    return values, next_nodes
 
 # --- ENDPOINTS ---
 
+async def _coalesced(endpoint: str, request_id: Optional[str], request: BaseModel, work):
+    """
+    Runs `work` once per (endpoint, X-Request-ID, thread); duplicates with the same
+    body share the result, a reused id with a different body gets 422.
+    """
+    try:
+        if not request_id:
+            return await work()
+        fingerprint = hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
+        key = (endpoint, request_id, getattr(request, "thread_id", None))
+        return await request_coalescer.run(key, work, fingerprint)
+    except RequestIdReusedError:
+        raise HTTPException(status_code=422, detail="X-Request-ID was already used for a different request.")
+    except ThreadBusyError:
+        raise HTTPException(status_code=409, detail="Thread is busy with another request. Retry shortly.")
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest, token: str = Depends(verify_api_key)):
-    thread_id = request.thread_id or f"session_{int(time.time())}"
+async def chat_endpoint(
+    request: ChatRequest,
+    token: str = Depends(verify_api_key),
+    x_request_id: Optional[str] = Header(default=None)
+):
+    thread_id = request.thread_id or new_thread_id()
     config = {"configurable": {"thread_id": thread_id}}
+    bind_log_context(thread_id=thread_id)
     logger.info(f"Chat Request [Thread: {thread_id}]")
 
-    try:
-        graph = await build_graph_for_request(service_state.checkpointer)
-        snapshot = await graph.aget_state(config)
-        
-        # Handle Silent ID Injection
-        if not snapshot.created_at:
-            msg = ("user", request.message)
-            initial_data = {}
-            if request.quote_id:
-                logger.info(f"[Thread: {thread_id}] Injecting Silent Quote ID: {request.quote_id}")
-                initial_data["key"] = request.quote_id 
-
-            payload = {
-                "messages": [msg], 
-                "is_approved": False,
-                "extracted_data": initial_data 
-            }
-        else:
-             # Resume logic
-            if snapshot.next and "Review_Gate" in snapshot.next:
-                 payload = {"messages": [("user", request.message)], "is_approved": False}
-            else:
-                payload = {"messages": [("user", request.message)]}
-        
-        await graph.ainvoke(payload, config)
-        
-        return await _format_response(graph, config, thread_id)
-        
-    except Exception as e:
-        raise e
+    async def work():
+        # One run per thread at a time: no double LLM spend, no checkpoint races
+        async with service_state.thread_locks.hold(thread_id):
+            graph = get_graph()
+            payload = await _build_chat_payload(graph, config, request, thread_id)
+
+            # Response is built from the run's own output (no second aget_state)
+            values, next_nodes = await _run_graph(graph, payload, config, thread_id)
+            return _build_chat_response(thread_id, values, next_nodes)
+
+    # A retry without thread_id coalesces too (key uses the client's thread_id)
+    return await _coalesced("chat", x_request_id, request, work)
+
+WORKFLOW_NODES = {"History", "Scout", "Agent", "Inspector", "Interviewer", "Review_Gate", "Submitter"}
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest, token: str = Depends(verify_api_key)):
+    """
+    Server-Sent Events version of /chat.
+    Frames: `node_start` / `node_end` (graph transitions), `token` (Interviewer LLM
+    tokens as they arrive), then one `final` frame carrying the ChatResponse.
+    """
+    thread_id = request.thread_id or new_thread_id()
+    config = {"configurable": {"thread_id": thread_id}}
+    bind_log_context(thread_id=thread_id)
+    logger.info(f"Chat Stream Request [Thread: {thread_id}]")
+
+    async def event_stream():
+        try:
+            async with service_state.thread_locks.hold(thread_id):
+                async for frame in _stream_run(thread_id, config, request):
+                    yield frame
+        except ThreadBusyError:
+            yield _sse("error", {"detail": "Thread is busy with another request.", "thread_id": thread_id})
+        except Exception as e:
+            ce = CustomException(e, sys)
+            logger.error(f"[Thread: {thread_id}] Stream Failed: {ce}")
+            yield _sse("error", {"detail": "Internal Server Error", "thread_id": thread_id})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _stream_run(thread_id: str, config: Dict[str, Any], request: ChatRequest):
+    """SSE frames for one run; the caller holds the thread lock."""
+    graph = get_graph()
+    payload = await _build_chat_payload(graph, config, request, thread_id)
+    final_values = None
+    last_node = None
+    thread_snapshot_cache.invalidate(thread_id)
+    async for event in graph.astream_events(payload, config, version="v2"):
+        kind = event["event"]
+        name = event.get("name")
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chat_model_stream" and node == "Interviewer":
+            content = event["data"]["chunk"].content
+            if content:
+                yield _sse("token", {"content": content})
+        elif kind in ("on_chain_start", "on_chain_end") and name in WORKFLOW_NODES and name == node:
+            if kind == "on_chain_end":
+                last_node = name
+            yield _sse("node_start" if kind == "on_chain_start" else "node_end", {"node": name})
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            # Root run finished: its output IS the final state (no extra aget_state)
+            final_values = event["data"].get("output")
+
+    if not isinstance(final_values, dict):
+        final_values = (await graph.aget_state(config)).values
+
+    # A run that ends right after Inspector was routed to (and paused before) Review_Gate
+    next_nodes = ("Review_Gate",) if last_node == "Inspector" else ()
+    thread_snapshot_cache.put(thread_id, final_values, next_nodes)
+    response = _build_chat_response(thread_id, final_values, next_nodes)
+    yield _sse("final", response.model_dump())
 
 @app.post("/approve", response_model=ChatResponse)
-async def approve_order(request: ApprovalRequest, token: str = Depends(verify_api_key)):
+async def approve_order(
+    request: ApprovalRequest,
+    token: str = Depends(verify_api_key),
+    x_request_id: Optional[str] = Header(default=None)
+):
     """
     Approves the order. Returns the FINAL response (including Price).
     """
     thread_id = request.thread_id
     config = {"configurable": {"thread_id": thread_id}}
+    bind_log_context(thread_id=thread_id)
     logger.info(f"Approval Request [Thread: {thread_id}]")
-    
-    try:
-        graph = await build_graph_for_request(service_state.checkpointer)
-        
-        snapshot = await graph.aget_state(config)
-        if not snapshot.next or "Review_Gate" not in snapshot.next:
-            raise HTTPException(status_code=400, detail="Workflow is not at Review Gate.")
-            
-        # 1. Update State
-        await graph.aupdate_state(config, {"is_approved": True})
-        
-        # 2. Resume Graph (This triggers Submitter -> MCP)
-        await graph.ainvoke(None, config)
-        
-        # 3. Fetch Final State (Should contain the Quote Message)
-        return await _format_response(graph, config, thread_id)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise e
+
+    async def work():
+        async with service_state.thread_locks.hold(thread_id):
+            graph = get_graph()
+
+            # Checked under the lock, against the checkpoint itself: a concurrent
+            # double-click sees the resumed thread, and another replica's turns count
+            exists, next_nodes = await _thread_state(graph, config, thread_id, fresh=True)
+            if not next_nodes or "Review_Gate" not in next_nodes:
+                # Already submitted (retry / double-click): replay the stored outcome
+                replay = await _replay_submission(thread_id)
+                if replay:
+                    return replay
+                raise HTTPException(status_code=400, detail="Workflow is not at Review Gate.")
+
+            # 1. Update State
+            thread_snapshot_cache.invalidate(thread_id)
+            await graph.aupdate_state(config, {"is_approved": True})
+
+            # 2. Resume Graph (This triggers Submitter -> MCP)
+            # 3. Final State comes straight from the run (Should contain the Quote Message)
+            values, next_nodes = await _run_graph(graph, None, config, thread_id)
+            return _build_chat_response(thread_id, values, next_nodes)
+
+    return await _coalesced("approve", x_request_id, request, work)
+
+async def _replay_submission(thread_id: str) -> Optional[ChatResponse]:
+    ledger = service_state.submission_ledger
+    record = await ledger.latest(thread_id) if ledger else None
+    if record is None:
+        return None
+    logger.info(f"[Thread: {thread_id}] Approval replayed from submission ledger (no upstream call).")
+    snapshot = thread_snapshot_cache.get(thread_id)
+    return ChatResponse(
+        thread_id=thread_id,
+        response=quote_message(record.result or ""),
+        extracted_data=snapshot.values.get("extracted_data") if snapshot else None,
+    )
 
 # Helper to avoid code duplication
-async def _format_response(graph, config, thread_id):
-    final_snapshot = await graph.aget_state(config)
-    
+def _build_chat_response(thread_id: str, values: Dict[str, Any], next_nodes) -> ChatResponse:
     # Logic to extract the LAST message (which contains the quote)
-    messages = final_snapshot.values.get("messages", [])
+    messages = values.get("messages", [])
     response_text = ""
     
     if messages:
@@ -235,23 +479,72 @@ async def _format_response(graph, config, thread_id):
         response_text = "Processing complete."
 
     is_paused = False
-    if final_snapshot.next and "Review_Gate" in final_snapshot.next:
+    if next_nodes and "Review_Gate" in next_nodes:
         is_paused = True
-        response_text = "Review required. Please check extracted data."
+        # After a failed submission the Submitter's message explains what to do
+        if not values.get("submission_failed"):
+            response_text = "Review required. Please check extracted data."
 
     logger.info(f"Response for {thread_id}: {response_text[:50]}...")
 
     return ChatResponse(
         thread_id=thread_id,
         response=str(response_text),
-        current_node=final_snapshot.next[0] if final_snapshot.next else None,
-        extracted_data=final_snapshot.values.get("extracted_data"),
+        current_node=next_nodes[0] if next_nodes else None,
+        extracted_data=values.get("extracted_data"),
         is_paused=is_paused,
-        missing_fields=final_snapshot.values.get("missing_fields", [])
+        missing_fields=values.get("missing_fields", []),
+        validation_issues=values.get("validation_issues", [])
     )
 
+def _collect_service_metrics():
+    """Scrape-time view of pools and caches (reads their counters; no I/O)."""
+    families = pool_families("checkpoint", service_state.pool) + pool_families("locks", service_state.lock_pool)
+    for name, stats in (
+        ("schema", schema_cache.stats()),
+        ("form_model", form_model_cache.cache_info()),
+        ("validation_plan", validation_plan_cache.cache_info()),
+        ("thread_snapshot", thread_snapshot_cache.stats()),
+    ):
+        families += cache_families(name, stats["hits"], stats["misses"])
+    if llm_response_cache is not None:
+        llm_stats = llm_response_cache.stats()
+        families += cache_families("llm_response", sum(llm_stats["hits"].values()), llm_stats["misses"])
+
+    router_stats = extraction_router.stats()
+    families.append(MetricFamily("agent_model_router_requests_total", "counter", "Routed LLM requests.",
+                                 [({"router": extraction_router.name}, router_stats["requests"])]))
+    families.append(MetricFamily("agent_model_router_escalations_total", "counter", "Requests escalated past the first model.",
+                                 [({"router": extraction_router.name}, router_stats["escalated"])]))
+    families.append(MetricFamily("agent_model_route_calls_total", "counter", "Calls per route and outcome.", [
+        ({"router": extraction_router.name, "route": route, "outcome": outcome}, route_stats[outcome])
+        for route, route_stats in router_stats["routes"].items()
+        for outcome in ("accepted", "rejected", "errors")
+    ]))
+
+    if service_state.mcp_pool:
+        mcp_stats = service_state.mcp_pool.stats()
+        families.append(MetricFamily("agent_mcp_sessions", "gauge", "Quote MCP sessions by state.", [
+            ({"state": state}, mcp_stats[state]) for state in ("size", "idle", "alive")
+        ]))
+        families.append(MetricFamily("agent_mcp_respawns_total", "counter", "Quote MCP session respawns.", [({}, mcp_stats["respawns"])]))
+
+    families.append(MetricFamily("agent_requests_coalesced_total", "counter", "Duplicate X-Request-ID requests served from one run.",
+                                 [({}, request_coalescer.stats()["coalesced"])]))
+    families.append(MetricFamily("agent_thread_lock_waits_total", "counter", "Requests that waited for the same thread.",
+                                 [({}, service_state.thread_locks.stats()["waits"])]))
+    return families
+
+metrics.register_collector(_collect_service_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus text format: node/LLM/MCP latency histograms, token counters, pool and cache stats."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/health")
 def health_check():
     if service_state.pool and not service_state.pool.closed:
-        return {"status": "ok", "db": "connected"}
+        workflow_version = service_state.graph_registry.active_version if service_state.graph_registry else None
+        return {"status": "ok", "db": "connected", "workflow_version": workflow_version}
     return JSONResponse(status_code=503, content={"status": "degraded", "db": "disconnected"})
\ No newline at end of file
@@ -2,12 +2,18 @@ from langgraph.graph import StateGraph, END, START
 from langgraph.checkpoint.memory import MemorySaver # For HITL
 from typing import Literal
 from ..agent_state.state import AgentState
+from ..project_nodes.history_node import history_node
 from ..project_nodes.scout_node import scout_node
 from ..project_nodes.agent_node import agent_node
 from ..project_nodes.inspector_node import inspector_node
 from ..project_nodes.interviewer_nodes import interviewer_node
 from ..project_nodes.review_nodes import review_node
 from ..project_nodes.submitter_node import submitter_node
+from ..utils.metrics import timed_node
+from shared_core.logger.logging import logger
+
+# Bump whenever nodes/edges change so the GraphRegistry can hot-swap cleanly
+WORKFLOW_VERSION = "3"
 
 # --- Routing Logic ---
 def routing_function_inspector(state: AgentState) -> Literal["incomplete", "complete"]:
@@ -23,9 +29,18 @@ def routing_function_review(state: AgentState) -> Literal["approve", "re-edit"]:
         return "approve"
     return "re-edit"
 
+def routing_function_submitter(state: AgentState) -> Literal["retry", "done"]:
+    """
+    A failed submission goes back to the Review_Gate (paused by interrupt_before),
+    so the next approval retries it.
+    """
+    if state.get("submission_failed") is True:
+        return "retry"
+    return "done"
+
 class AgentWorkflowBuilder:
     def __init__(self):
-        print("[INFO]: Initializing Agent Workflow Builder...")
+        logger.info("Initializing Agent Workflow Builder...")
 
     async def build(self, checkpointer=None):
         # 1. Initialize Memory for HITL (default if no checkpointer passed)
@@ -34,16 +49,19 @@ class AgentWorkflowBuilder:
             
         workflow = StateGraph(AgentState)
 
-        # 2. Add All Nodes
-        workflow.add_node("Scout", scout_node)
-        workflow.add_node("Agent", agent_node)
-        workflow.add_node("Inspector", inspector_node)
-        workflow.add_node("Interviewer", interviewer_node)
-        workflow.add_node("Review_Gate", review_node)
-        workflow.add_node("Submitter", submitter_node)
+        # 2. Add All Nodes (timed for /metrics)
+        workflow.add_node("History", timed_node("History", history_node))
+        workflow.add_node("Scout", timed_node("Scout", scout_node))
+        workflow.add_node("Agent", timed_node("Agent", agent_node))
+        workflow.add_node("Inspector", timed_node("Inspector", inspector_node))
+        workflow.add_node("Interviewer", timed_node("Interviewer", interviewer_node))
+        workflow.add_node("Review_Gate", timed_node("Review_Gate", review_node))
+        workflow.add_node("Submitter", timed_node("Submitter", submitter_node))
 
         # 3. Define the Flow
-        workflow.add_edge(START, "Scout")
+        # Every new turn first bounds the message history (keeps checkpoints small)
+        workflow.add_edge(START, "History")
+        workflow.add_edge("History", "Scout")
         workflow.add_edge("Scout", "Agent")
         workflow.add_edge("Agent", "Inspector")
 
@@ -67,7 +85,11 @@ class AgentWorkflowBuilder:
             }
         )
 
-        workflow.add_edge("Submitter", END)
+        workflow.add_conditional_edges(
+            "Submitter",
+            routing_function_submitter,
+            {"retry": "Review_Gate", "done": END}
+        )
 
         # 5. Compile with Interrupt
         # We PAUSE the graph right before the Review_Gate node runs
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Callable, Dict, Optional
+from langgraph.graph.state import CompiledStateGraph
+
+from .agent_workflow import AgentWorkflowBuilder, WORKFLOW_VERSION
+from shared_core.logger.logging import logger
+
+
+class GraphRegistry:
+    """
+    Process-wide registry of compiled workflow graphs.
+
+    The graph is compiled ONCE (during app lifespan) and bound to the shared
+    checkpointer. A compiled LangGraph is stateless between invocations (all
+    per-thread state lives in the checkpointer), so the same object is safe to
+    reuse across concurrent requests.
+
+    Hot-swap: `swap()` compiles a new version off to the side and only then
+    flips the active pointer. Requests that already grabbed the old graph
+    finish on it; new requests pick up the new one.
+    """
+
+    def __init__(self, checkpointer=None, builder_factory: Callable[[], AgentWorkflowBuilder] = AgentWorkflowBuilder):
+        self.checkpointer = checkpointer
+        self.builder_factory = builder_factory
+        self._graphs: Dict[str, CompiledStateGraph] = {}
+        self._active_version: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def active_version(self) -> Optional[str]:
+        return self._active_version
+
+    @property
+    def versions(self) -> list:
+        return list(self._graphs.keys())
+
+    async def _compile(self, version: str, builder_factory=None) -> CompiledStateGraph:
+        builder = (builder_factory or self.builder_factory)()
+        graph = await builder.build(checkpointer=self.checkpointer)
+        logger.info(f"Workflow graph compiled (version={version}).")
+        return graph
+
+    async def load(self, version: str = WORKFLOW_VERSION) -> CompiledStateGraph:
+        """Compiles (if needed) and activates the given version."""
+        async with self._lock:
+            if version not in self._graphs:
+                self._graphs[version] = await self._compile(version)
+            self._active_version = version
+            return self._graphs[version]
+
+    async def swap(self, version: str, builder_factory=None) -> CompiledStateGraph:
+        """
+        Compiles a new workflow definition under `version` and makes it active.
+        Re-swapping to an already compiled version is just a pointer flip.
+        """
+        async with self._lock:
+            graph = self._graphs.get(version)
+            if graph is None or builder_factory is not None:
+                graph = await self._compile(version, builder_factory)
+                self._graphs[version] = graph
+            previous = self._active_version
+            self._active_version = version
+            logger.info(f"Workflow graph swapped: {previous} -> {version}")
+            return graph
+
+    def retire(self, version: str) -> None:
+        """Drops an inactive version (in-flight requests keep their reference)."""
+        if version == self._active_version:
+            raise ValueError(f"Cannot retire the active workflow version '{version}'.")
+        self._graphs.pop(version, None)
+
+    def get(self, version: Optional[str] = None) -> CompiledStateGraph:
+        version = version or self._active_version
+        if version is None or version not in self._graphs:
+            raise RuntimeError("Workflow graph is not loaded. Call `await registry.load()` during startup.")
+        return self._graphs[version]
@@ -10,5 +10,9 @@ class AgentState(TypedDict):
     extracted_data: dict
     # To track what is missing
     missing_fields: List[str]
+    # Structured version of missing_fields: {"code", "message", "field", "item"}
+    validation_issues: List[dict]
     # Approval flag
-    is_approved: bool
\ No newline at end of file
+    is_approved: bool
+    # Last Submitter run failed upstream (the thread is back at Review_Gate)
+    submission_failed: bool
\ No newline at end of file
@@ -1,13 +1,22 @@
+import copy
 import json
+from typing import Optional
+from pydantic import ValidationError
 from ..agent_state.state import AgentState
-from ..utils.model_loader import ModelLoader
+from ..utils.model_loader import ModelLoader, ConfigLoader
 from ..prompt_library.prompts import FORM_FILLER_SYSTEM_PROMPT
-from ..schemas.form_schema import create_dynamic_model
+from ..schemas.form_schema import form_model_cache
+from ..schemas.validation_plan import validation_plan_cache
+from ..utils.pre_extractor import is_item_edit, is_item_removal, is_new_item, pre_extract
+from ..utils.context_builder import build_agent_context
+from .inspector_node import find_missing_fields
 from shared_core.logger.logging import logger
 
-# Load the model once
+# Load the models once: fast first, smart only when the fast output fails the checks
 model_loader = ModelLoader()
-llm = model_loader.load_llm(model_type="smart")
+router = model_loader.load_router("extraction")
+llm = router.primary_llm
+context_settings = ConfigLoader()["agent_context"] or {}
 
 def format_fields_for_prompt(fields_list):
     mapping_reference = {
@@ -33,14 +42,65 @@ def format_fields_for_prompt(fields_list):
         formatted.append(line)
     return formatted
 
+def last_user_text(messages) -> str:
+    for msg in reversed(messages):
+        if getattr(msg, "type", None) == "human":
+            return str(msg.content)
+    return ""
+
+def validate_partial(model, data: dict) -> dict:
+    """Coerces pre-extracted values through the dynamic model; drops fields it rejects."""
+    for _ in range(2):
+        try:
+            return model.model_validate(data).model_dump(exclude_none=True)
+        except ValidationError as e:
+            bad = {err["loc"][0] for err in e.errors() if err.get("loc")}
+            data = {k: v for k, v in data.items() if k not in bad}
+    return {}
+
+def merge_extracted(current: dict, new_data: dict) -> dict:
+    """
+    Merges a partial extraction into the current data.
+    A single pre-extracted item is merged field-by-field into a single existing item;
+    an empty 'items' list never wipes items we already have.
+    """
+    merged = current.copy()
+    for key, value in new_data.items():
+        if key != "items":
+            merged[key] = value
+            continue
+        existing = merged.get("items") or []
+        if not value:
+            continue
+        if len(value) == 1 and len(existing) == 1:
+            merged["items"] = [{**existing[0], **value[0]}]
+        else:
+            merged["items"] = [dict(item) for item in value]
+    return merged
+
+def merge_pre_extracted(current: dict, pre_data: dict, edits_item: bool, adds_item: bool) -> dict:
+    """
+    Applies a pre-extraction, which never holds more than one item.
+    That item only lands on a single existing item when the message edits it or
+    it just fills fields still missing there; otherwise (a new item, a list of
+    2+ items, conflicting values) the items are left to the LLM.
+    """
+    existing = current.get("items") or []
+    if pre_data.get("items") and existing:
+        new_item = pre_data["items"][0]
+        fills_gaps = len(existing) == 1 and all(
+            existing[0].get(k) in (None, "") or existing[0].get(k) == v for k, v in new_item.items()
+        )
+        if len(existing) > 1 or adds_item or not (edits_item or fills_gaps):
+            pre_data = {k: v for k, v in pre_data.items() if k != "items"}
+    return merge_extracted(current, pre_data)
+
 async def agent_node(state: AgentState):
     logger.info("--- [NODE]: AGENT (Multiple Items Extraction) ---")
     
     api_schema = state.get("form_schema", {})
-    DynamicModel = create_dynamic_model(api_schema)
-    
-    # api_schema = state.get("form_schema", {}) # Already retrieved above
-    # DynamicModel is created above
+    # Memoized by schema fingerprint: model class + structured-output binding are reused
+    compiled = form_model_cache.get(api_schema)
     
     # OPTIMIZATION: Removed manual schema injection ("Context Bloat").
     # The llm.with_structured_output(DynamicModel) handles the schema definition natively.
@@ -54,19 +114,59 @@ async def agent_node(state: AgentState):
         "4. For fields like 'service_level', use the short code 'WG' only."
     )
 
-    structured_llm = llm.with_structured_output(DynamicModel)
-    logger.info("Invoking Agent...")
+    # 1. DETERMINISTIC PRE-EXTRACTION: ZIPs, weights, dims, codes... straight from the text
+    current_data = state.get("extracted_data", {})
+    pre_data = {}
+    user_text = last_user_text(state["messages"])
+    raw = pre_extract(user_text, api_schema)
+    if raw:
+        pre_data = validate_partial(compiled.model, raw)
+    base_data = merge_pre_extracted(current_data, pre_data, is_item_edit(user_text), is_new_item(user_text))
+
+    remaining = find_missing_fields(copy.deepcopy(base_data), api_schema)
+    if pre_data and not remaining and not current_data.get("items"):
+        # Inspector would pass already: no LLM call needed this turn.
+        # Not once items exist: "add another box ..." must reach the LLM.
+        logger.info(f"Pre-extraction complete ({len(pre_data)} keys). Skipping LLM.")
+        return {"extracted_data": base_data, "messages": [("assistant", "Details updated.")]}
+
+    # 2. DELTA CONTEXT: current form + open issues + only the new user message
+    context = build_agent_context(
+        sys_msg,
+        base_data,
+        remaining,
+        state["messages"],
+        token_budget=int(context_settings.get("token_budget", 1500)),
+        max_question_chars=int(context_settings.get("max_question_chars", 600)),
+        model_name=getattr(llm, "model_name", "gpt-4o"),
+    )
+
+    plan = validation_plan_cache.get(api_schema)
+    removes_item = is_item_removal(user_text)
+
+    def check(response) -> Optional[str]:
+        # Inspector rules on the merged result: invalid codes / broken fields / lost items escalate
+        merged = merge_extracted(base_data, response.model_dump(exclude_none=True))
+        regressions = plan.regressions(base_data, merged, allow_removal=removes_item)
+        return "; ".join(issue.message for issue in regressions) or None
+
+    logger.info(f"Invoking Agent... (context: {context.token_count} tokens)")
     try:
-        response = await structured_llm.ainvoke([("system", sys_msg)] + state["messages"][-6:])
-        new_data = response.model_dump(exclude_none=True)
+        result = await router.ainvoke(
+            lambda model: form_model_cache.get(api_schema, model).structured_llm,
+            context.messages,
+            accept=check,
+        )
+        new_data = result.value.model_dump(exclude_none=True)
         
         # Professional State Merging: 
         # For 'items', we overwrite the list if new specific item data is provided
-        updated_data = state.get("extracted_data", {}).copy()
-        updated_data.update(new_data)
+        updated_data = merge_extracted(base_data, new_data)
 
-        logger.info(f"Extracted {len(updated_data.get('items', []))} distinct items.")
+        logger.info(f"Extracted {len(updated_data.get('items', []))} distinct items (model: {result.route}).")
         return {"extracted_data": updated_data, "messages": [("assistant", "Details updated.")]}
     except Exception as e:
         logger.error(f"Extraction Error: {e}")
-        return state
\ No newline at end of file
+        if pre_data:
+            return {"extracted_data": base_data, "messages": [("assistant", "Details updated.")]}
+        return state
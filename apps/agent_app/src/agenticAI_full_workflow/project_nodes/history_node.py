@@ -0,0 +1,85 @@
+from langchain_core.messages import RemoveMessage, SystemMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from ..agent_state.state import AgentState
+from ..utils.model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+# Fixed id: add_messages replaces the summary in place instead of appending a new one
+SUMMARY_MESSAGE_ID = "history_summary"
+SUMMARY_HEADER = "Earlier conversation (summarized):"
+ACK_MESSAGES = {"Details updated."}
+
+history_settings = ConfigLoader()["history"] or {}
+
+def _line(msg, max_chars: int) -> str:
+    role = "User" if msg.type == "human" else "Assistant"
+    text = " ".join(str(msg.content).split())
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    return f"{role}: {text}"
+
+def plan_history_trim(messages, max_turns: int = 6, mode: str = "summarize",
+                      summary_max_chars: int = 1500, line_max_chars: int = 200) -> list:
+    """
+    Returns the message updates (RemoveMessage / summary) that bound the history:
+    the last `max_turns` user turns stay verbatim, older ones are folded into a
+    single summary message ("summarize") or simply dropped ("drop") since the
+    facts already live in extracted_data. Old "Details updated." acks are always dropped.
+    """
+    if max_turns <= 0:
+        return []
+
+    previous_summary = next((m for m in messages if m.id == SUMMARY_MESSAGE_ID), None)
+    history = [m for m in messages if m.id != SUMMARY_MESSAGE_ID]
+
+    human_positions = [i for i, m in enumerate(history) if m.type == "human"]
+    cutoff = human_positions[-max_turns] if len(human_positions) > max_turns else 0
+
+    updates = []
+    folded = []
+    kept = []
+    for i, msg in enumerate(history):
+        is_ack = msg.type == "ai" and str(msg.content) in ACK_MESSAGES
+        if i < cutoff:
+            updates.append(RemoveMessage(id=msg.id))
+            if msg.type in ("human", "ai") and not is_ack:
+                folded.append(_line(msg, line_max_chars))
+        elif is_ack:
+            updates.append(RemoveMessage(id=msg.id))
+        else:
+            kept.append(msg)
+
+    if mode == "summarize" and folded:
+        previous_body = str(previous_summary.content).replace(SUMMARY_HEADER, "", 1).strip() if previous_summary else ""
+        body = "\n".join(([previous_body] if previous_body else []) + folded)
+        if len(body) > summary_max_chars:
+            # Keep the most recent part
+            body = "..." + body[-summary_max_chars:]
+        summary = SystemMessage(content=f"{SUMMARY_HEADER}\n{body}", id=SUMMARY_MESSAGE_ID)
+        # Rewrite the list so the summary sits first (add_messages would append a new id at the end)
+        return [RemoveMessage(id=REMOVE_ALL_MESSAGES), summary] + kept
+    if mode == "drop" and previous_summary:
+        updates.append(RemoveMessage(id=SUMMARY_MESSAGE_ID))
+
+    return updates
+
+async def history_node(state: AgentState):
+    """
+    Bounds AgentState.messages before each new turn so checkpoints stay small.
+    """
+    messages = state.get("messages", [])
+    updates = plan_history_trim(
+        messages,
+        max_turns=int(history_settings.get("max_turns", 6)),
+        mode=history_settings.get("mode", "summarize"),
+        summary_max_chars=int(history_settings.get("summary_max_chars", 1500)),
+    )
+    if not updates:
+        return {}
+
+    kept = sum(1 for u in updates if not isinstance(u, RemoveMessage))
+    if any(isinstance(u, RemoveMessage) and u.id == REMOVE_ALL_MESSAGES for u in updates):
+        logger.info(f"--- [NODE]: HISTORY (Folded {len(messages)} messages into summary + {kept - 1}) ---")
+    else:
+        logger.info(f"--- [NODE]: HISTORY (Trimmed {len(updates) - kept} of {len(messages)} messages) ---")
+    return {"messages": updates}
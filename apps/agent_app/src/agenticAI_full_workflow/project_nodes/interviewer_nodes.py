@@ -1,32 +1,42 @@
+from langchain_core.messages import AIMessage
 from ..agent_state.state import AgentState
-from ..utils.model_loader import ModelLoader
+from ..utils.model_loader import ModelLoader, ConfigLoader
+from ..prompt_library.interviewer_templates import help_for, needs_llm_wording, render_clarification
+from shared_core.logger.logging import logger
 
 model_loader = ModelLoader()
 llm = model_loader.load_llm(model_type="fast")
 
+# LLM wording is the exception; templates cover the Inspector's fixed issue strings
+interviewer_settings = ConfigLoader()["interviewer"] or {}
+
 async def interviewer_node(state: AgentState):
     """
     The Voice: Requests specific missing info and provides dropdown options to the user.
     """
-    print("--- [NODE]: INTERVIEWER (Requesting Clarification) ---")
-    
+    logger.info("--- [NODE]: INTERVIEWER (Requesting Clarification) ---")
+
     missing_info = state.get("missing_fields", [])
-    
-    # INDUSTRIAL CONFIG: Define the "Menu" options to show the user
-    categorical_help = {
-        "service_level": "WG (White Glove), ROC (Room of Choice), TRHD (Threshold), DS (Door Step)",
-        "packing_details": "ps (Shipper Packed), pc (Carrier Packed), cc (Crated)",
-        "pickup_type_code": "bp (Business Pickup), rp (Residential Pickup), do (Origin Drop-off)"
-    }
+
+    # 0. Template path: no network round trip for the common cases
+    use_llm = interviewer_settings.get("llm_fallback", True) and needs_llm_wording(
+        missing_info,
+        max_items=int(interviewer_settings.get("max_template_items", 3)),
+        max_issues=int(interviewer_settings.get("max_template_issues", 8)),
+    )
+    if not use_llm:
+        return {
+            "messages": [AIMessage(content=render_clarification(missing_info))]
+        }
 
     # 1. Create a "Field Guide" for the LLM based on what is actually missing
     field_guide = []
     for issue in missing_info:
         guide_entry = f"- {issue}"
         # Check if we have specific options for this missing field
-        for key, options in categorical_help.items():
-            if key in issue.lower().replace(" ", "_"):
-                guide_entry += f" | Available Options: [{options}]"
+        options = help_for(issue)
+        if options:
+            guide_entry += f" | Available Options: [{options}]"
         field_guide.append(guide_entry)
 
     # 2. Professional Prompting
@@ -39,11 +49,11 @@ async def interviewer_node(state: AgentState):
         "4. Keep it concise. Do not talk about things that are NOT in the issues list.\n\n"
         "ISSUES TO RESOLVE:\n" + "\n".join(field_guide)
     )
-    
+
     # 3. Generate response using context
     messages = [("system", system_prompt)] + state["messages"][-5:] # Last few messages for context
     response = await llm.ainvoke(messages)
-    
+
     return {
         "messages": [response]
-    }
\ No newline at end of file
+    }
@@ -1,9 +1,10 @@
 from ..agent_state.state import AgentState
+from shared_core.logger.logging import logger
 
 async def review_node(state: AgentState):
     """
     This node runs AFTER the user says 'Yes' and the graph is resumed.
     """
-    print("--- [NODE]: REVIEW GATE (Verified) ---")
+    logger.info("--- [NODE]: REVIEW GATE (Verified) ---")
     # No changes needed to state here, as app.py already set is_approved = True
     return state
\ No newline at end of file
@@ -1,5 +1,5 @@
 from ..agent_state.state import AgentState
-from ..utils.api_loader import MetroApiSchemaParser
+from ..utils.schema_cache import schema_cache
 from shared_core.logger.logging import logger
 
 async def scout_node(state: AgentState):
@@ -17,17 +17,17 @@ async def scout_node(state: AgentState):
         return state
 
     # 2. FETCH ONLY IF NECESSARY
+    # Process-wide cache: new threads share one parsed copy (TTL + ETag revalidation)
     try:
-        logger.info("  >> Cache Miss! Fetching fresh schema from API...")
-        parser = MetroApiSchemaParser()
-        metadata = await parser.get_price_v2_metadata()
+        logger.info("  >> Not in thread state. Loading schema from shared cache...")
+        metadata = await schema_cache.get_metadata()
         
         if not metadata:
             # Defensive coding: error handle karein bajaye crash karne ke
             logger.error("API returned empty metadata.")
             return state 
 
-        logger.info("  >> Successfully fetched and parsed schema.")
+        logger.info("  >> Schema ready.")
         
         # 3. SAVE TO STATE
         return {
@@ -1,22 +1,38 @@
+import json
+from langchain_core.runnables import RunnableConfig
 from ..agent_state.state import AgentState
-import os
-import sys
-
-# Try importing MCP components
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    # If mcp is not installed directly, we might need to handle it or rely on langchain adapters if used differently.
-    # But for this custom integration, we need direct mcp access.
-    pass 
-
-async def submitter_node(state: AgentState):
+from ..utils.mcp_pool import quote_call_timeout, quote_mcp_session
+from ..utils.metrics import mcp_duration
+from ..utils.submission_ledger import SUCCEEDED, get_submission_ledger, payload_hash
+from ..utils.tracing import CLIENT, tracer
+from shared_core.logger.logging import logger
+
+def _is_error_result(text: str) -> bool:
+    """
+    The Quote MCP server returns the upstream body only for 2xx responses; every
+    failure (non-2xx status, auth, transport) is JSON with an "error" key.
+    Anything that is not a JSON object is not a quote either.
+    """
+    try:
+        parsed = json.loads(text)
+    except (TypeError, ValueError):
+        return True
+    return not isinstance(parsed, dict) or "error" in parsed
+
+def failure_message(mcp_output: str) -> str:
+    return f"Quote submission failed. Approve again to retry.\n\nDetails:\n{mcp_output or 'No result from the Quote Server.'}"
+
+def quote_message(mcp_output: str) -> str:
+    if mcp_output:
+        return f"Order successfully generated!\n\nQuote Result:\n{mcp_output}"
+    return "Order successfully generated! Please copy the JSON payload above."
+
+async def submitter_node(state: AgentState, config: RunnableConfig):
     """
     Final node that runs after manual approval.
     TRANSFORMS extracted data into the exact MetroQuotes API Payload.
     """
-    print("--- [NODE]: SUBMITTER (Final Submission) ---")
+    logger.info("--- [NODE]: SUBMITTER (Final Submission) ---")
     
     data = state.get("extracted_data", {})
     
@@ -153,79 +169,82 @@ async def submitter_node(state: AgentState):
     }
     
     # --- 3. OUTPUT ---
-    import json
     formatted_json = json.dumps(final_payload, indent=2)
     
-    print("\n" + "="*50)
-    print("       [FINAL API PAYLOAD] (COPY BELOW)       ")
-    print("="*50)
-    print(formatted_json)
-    print("="*50 + "\n")
+    logger.info(f"[FINAL API PAYLOAD] (COPY BELOW)\n{formatted_json}")
 
-    # --- 4. MCP INTEGRATION FOR PRICING ---
+    # --- 4. IDEMPOTENCY LEDGER ---
+    # The same payload on the same thread is priced once; repeats replay the stored result
+    ledger = get_submission_ledger()
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    digest = payload_hash(final_payload)
+    if ledger and thread_id:
+        claimed, record = await ledger.claim(thread_id, digest)
+        if not claimed:
+            if record and record.status == SUCCEEDED:
+                logger.info("Already submitted: replaying stored quote result.")
+                return {"messages": [("assistant", quote_message(record.result or ""))]}
+            logger.info("Submission already in progress for this thread.")
+            return {"messages": [("assistant", "This order is already being submitted. Please check back shortly.")]}
+
+    # --- 5. MCP INTEGRATION FOR PRICING ---
     mcp_output = ""
+    texts = []
+    failed = False
     try:
-        # Resolve Project Root
-        # We are at: .../apps/agent_app/src/agenticAI_full_workflow/project_nodes/submitter_node.py
-        # We need: .../mcp_servers/pricing_server/src/server.py
-        
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Walk up to find 'apps' folder, then go one level up to root
-        # Heuristic: Find directory containing 'mcp_servers'
-        
-        root_dir = current_dir
-        while len(root_dir) > 5 and not os.path.exists(os.path.join(root_dir, "mcp_servers")):
-            parent = os.path.dirname(root_dir)
-            if parent == root_dir: break
-            root_dir = parent
-            
-        # Updated to point to 'quote_mcp'
-        server_dir = os.path.join(root_dir, "mcp_servers", "quote_mcp")
-        server_script = os.path.join(server_dir, "server.py")
-        
-        if os.path.exists(server_script):
-            print("\n" + "-"*40)
-            print("MCP AGENT: Connecting to Quote Server...")
-            print("-" * 40)
-            
-            # Run the MCP server using 'uv'
-            server_params = StdioServerParameters(
-    command="python",  # Use the python already in your path
-    args=["server.py"], # Call the script directly
-    cwd=server_dir,
-    env=os.environ.copy() 
-)
-            
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Call the generate_quote tool
-                    print(">> Requesting Quote Generation...")
-                    # The tool expects 'data' as the argument name
-                    result = await session.call_tool("generate_quote", arguments={"data": final_payload})
-                    
-                    if result and hasattr(result, 'content'):
-                        for content in result.content:
-                            if content.type == "text":
-                                print(f"\n{content.text}\n")
-                                mcp_output += content.text + "\n"
-                    else:
-                        print(">> No content in result.")
-                        
-            print("-" * 40 + "\n")
-        else:
-            print(f"[WARNING]: Quote Server not found at {server_script}")
-            mcp_output = f"Could not find Quote Server at {server_script}"
+        # Borrow a long-lived, initialized session (pool owned by the app lifespan).
+        # Standalone runs without a pool fall back to a one-shot server process.
+        logger.info("MCP AGENT: Connecting to Quote Server...")
+
+        async with quote_mcp_session() as session:
+            # Call the generate_quote tool
+            logger.info("Requesting Quote Generation...")
+            # The tool expects 'data' as the argument name
+            # The span's traceparent rides in the request _meta, so the server's spans join this trace
+            with mcp_duration.time(tool="generate_quote"), tracer.span("mcp generate_quote", CLIENT, {"rpc.system": "mcp", "rpc.method": "generate_quote"}) as span:
+                meta = {"traceparent": span.traceparent} if span is not None else None
+                result = await session.call_tool(
+                    "generate_quote", arguments={"data": final_payload}, read_timeout_seconds=quote_call_timeout(), meta=meta
+                )
+                failed = bool(getattr(result, "isError", False))
+                if span is not None and failed:
+                    span.error = "tool returned isError"
             
+            if result and hasattr(result, 'content'):
+                for content in result.content:
+                    if content.type == "text":
+                        logger.info(f"Quote Result:\n{content.text}")
+                        texts.append(content.text)
+                        mcp_output += content.text + "\n"
+            else:
+                logger.warning("No content in MCP result.")
+
+    except FileNotFoundError as e:
+        logger.warning(str(e))
+        mcp_output = f"Could not find Quote Server: {e}"
+        failed = True
     except Exception as e:
-        print(f"[ERROR]: MCP Pricing Check Failed: {e}")
+        logger.error(f"MCP Pricing Check Failed: {e}")
         mcp_output = f"MCP Error: {str(e)}"
-    
-    final_message = "Order successfully generated! Please copy the JSON payload above."
-    if mcp_output:
-        final_message = f"Order successfully generated!\n\nQuote Result:\n{mcp_output}"
+        failed = True
+
+    failed = failed or not texts or any(_is_error_result(text) for text in texts)
+    if ledger and thread_id:
+        # Failures are recorded but not replayed: the next approval retries upstream
+        await ledger.finish(thread_id, digest, succeeded=not failed, result=mcp_output)
+
+    if failed:
+        # Back to Review_Gate (the graph pauses there again), so /approve can retry
+        logger.warning("Quote submission failed; re-arming Review_Gate.")
+        return {
+            "messages": [("assistant", failure_message(mcp_output))],
+            "is_approved": False,
+            "submission_failed": True,
+        }
+
+    final_message = quote_message(mcp_output)
 
     return {
-        "messages": [("assistant", final_message)]
+        "messages": [("assistant", final_message)],
+        "submission_failed": False,
     }
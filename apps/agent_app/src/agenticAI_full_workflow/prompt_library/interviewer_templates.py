@@ -0,0 +1,125 @@
+"""
+Deterministic clarification messages for the Interviewer.
+
+The Inspector emits a small, fixed vocabulary of issue strings
+("Item 2: Weight is missing.", "Invalid service_level: 'XL'.", ...). Those are
+rendered straight into a question here; the LLM is only used when an issue
+falls outside that vocabulary or the message would get too long to read.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# INDUSTRIAL CONFIG: The "Menu" options to show the user
+CATEGORICAL_HELP = {
+    "service_level": "WG (White Glove), ROC (Room of Choice), TRHD (Threshold), DS (Door Step)",
+    "packing_details": "ps (Shipper Packed), pc (Carrier Packed), cc (Crated)",
+    "pickup_type_code": "bp (Business Pickup), rp (Residential Pickup), do (Origin Drop-off)"
+}
+
+ITEM_ISSUE_RE = re.compile(r"^Item (\d+): (.+?)\.?$")
+INVALID_CODE_RE = re.compile(r"^Invalid (\w+): '(.*)'\.?$")
+TOP_LEVEL_MISSING_RE = re.compile(r"^(.+?) is missing\.?$")
+
+ITEM_PROMPTS = {
+    "Weight is missing": "estimated weight (lb or kg)",
+    "Quantity is missing": "quantity (number of pieces)",
+    "Dimensions or Volume missing": "dimensions (L x W x H, inches or cm) or total volume (cubic feet)",
+}
+
+NO_ITEMS_PROMPT = (
+    "Please describe each item you are shipping: quantity, estimated weight, "
+    "and either dimensions (L x W x H) or total volume (cubic feet)."
+)
+
+
+def help_for(issue: str) -> Optional[str]:
+    """Option menu for an issue that mentions a categorical field, if any."""
+    normalized = issue.lower().replace(" ", "_")
+    for key, options in CATEGORICAL_HELP.items():
+        if key in normalized:
+            return options
+    return None
+
+
+def classify_issues(missing_fields: List[str]) -> Tuple[Dict[str, List[str]], List[str], List[str], bool, List[str]]:
+    """
+    Splits Inspector issues into (per-item asks, top-level asks, invalid-code asks,
+    no-items flag, unrecognized issues).
+    """
+    per_item: Dict[str, List[str]] = OrderedDict()
+    top_level: List[str] = []
+    invalid: List[str] = []
+    unknown: List[str] = []
+    no_items = False
+
+    for issue in missing_fields:
+        issue = issue.strip()
+        if issue == "Shipment Items details are missing.":
+            no_items = True
+            continue
+
+        m = ITEM_ISSUE_RE.match(issue)
+        if m and m.group(2) in ITEM_PROMPTS:
+            per_item.setdefault(m.group(1), []).append(ITEM_PROMPTS[m.group(2)])
+            continue
+
+        m = INVALID_CODE_RE.match(issue)
+        if m:
+            field, value = m.group(1), m.group(2)
+            line = f"{field.replace('_', ' ')}: '{value}' is not a valid option."
+            options = help_for(field)
+            if options:
+                line += f" Please choose one of: {options}"
+            invalid.append(line)
+            continue
+
+        m = TOP_LEVEL_MISSING_RE.match(issue)
+        if m and not m.group(1).lower().startswith("item"):
+            top_level.append(m.group(1))
+            continue
+
+        unknown.append(issue)
+
+    return per_item, top_level, invalid, no_items, unknown
+
+
+def needs_llm_wording(missing_fields: List[str], max_items: int = 3, max_issues: int = 8) -> bool:
+    """Heuristic: free-text issues or long multi-item asks read better from the LLM."""
+    if not missing_fields:
+        return False
+    per_item, _, _, _, unknown = classify_issues(missing_fields)
+    return bool(unknown) or len(per_item) > max_items or len(missing_fields) > max_issues
+
+
+def render_clarification(missing_fields: List[str]) -> str:
+    """Renders a clarification message grouped by shipment / item."""
+    per_item, top_level, invalid, no_items, unknown = classify_issues(missing_fields)
+    lines = ["To prepare your quote, I still need a few details:"]
+
+    if top_level:
+        lines.append("")
+        lines.append("Shipment:")
+        for name in top_level:
+            options = help_for(name)
+            lines.append(f"- {name} (options: {options})" if options else f"- {name}")
+
+    if no_items:
+        lines.append("")
+        lines.append(NO_ITEMS_PROMPT)
+
+    for item_no, asks in per_item.items():
+        lines.append("")
+        lines.append(f"Item {item_no}:")
+        lines.extend(f"- {ask}" for ask in asks)
+
+    if invalid:
+        lines.append("")
+        lines.extend(invalid)
+
+    if unknown:
+        lines.append("")
+        lines.extend(f"- {issue}" for issue in unknown)
+
+    return "\n".join(lines)
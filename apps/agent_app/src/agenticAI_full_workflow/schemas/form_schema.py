@@ -1,4 +1,7 @@
-from typing import List, Optional, Literal
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Literal, Type
 from pydantic import BaseModel, Field, create_model
 
 # Standard Enums
@@ -6,7 +9,15 @@ ServiceLevelCode = Literal["WG", "ROC", "TRHD", "DS"]
 PackingDetails = Literal["ps", "pc", "cc", "bwc", "pcc"]
 PickupType = Literal["bp", "dd", "do", "mw", "rp"]
 
-def create_dynamic_model(api_schema: dict):
+def schema_fingerprint(api_schema: dict) -> str:
+    """Stable content hash of the scouted field lists (key order independent)."""
+    canonical = json.dumps(
+        [api_schema.get("required_fields", []), api_schema.get("optional_fields", [])],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _build_dynamic_model(api_schema: dict) -> Type[BaseModel]:
     """
     Industry-Ready: Creates a Nested Pydantic Model to support multiple items.
     """
@@ -45,4 +56,83 @@ def create_dynamic_model(api_schema: dict):
     # 3. Add the List of Items to the Main Model
     main_fields["items"] = (List[ItemModel], Field(default_factory=list))
 
-    return create_model("StrictNestedFormModel", **main_fields)
\ No newline at end of file
+    return create_model("StrictNestedFormModel", **main_fields)
+
+class CompiledFormModel(NamedTuple):
+    fingerprint: str
+    model: Type[BaseModel]
+    json_schema: Dict[str, Any]
+    # llm.with_structured_output(model); None when no llm was supplied
+    structured_llm: Any = None
+
+
+class FormModelCache:
+    """
+    Bounded LRU of compiled form models keyed by schema fingerprint.
+
+    Pydantic class creation, JSON-schema generation and the structured-output
+    binding (tool definition) happen once per schema instead of every turn.
+    Runnables are cached per (fingerprint, llm) so several models can share
+    one compiled Pydantic class.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._models: "OrderedDict[str, CompiledFormModel]" = OrderedDict()
+        self._runnables: "OrderedDict[tuple, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _touch(self, store: OrderedDict, key, value=None):
+        if value is not None:
+            store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def get(self, api_schema: dict, llm: Any = None) -> CompiledFormModel:
+        fingerprint = schema_fingerprint(api_schema)
+
+        compiled = self._models.get(fingerprint)
+        if compiled is None:
+            self.misses += 1
+            model = _build_dynamic_model(api_schema)
+            compiled = CompiledFormModel(fingerprint, model, model.model_json_schema())
+            self._touch(self._models, fingerprint, compiled)
+        else:
+            self.hits += 1
+            self._touch(self._models, fingerprint)
+
+        if llm is None:
+            return compiled
+
+        # id(llm) is stable: the cached runnable keeps the llm alive
+        runnable_key = (fingerprint, id(llm))
+        structured_llm = self._runnables.get(runnable_key)
+        if structured_llm is None:
+            structured_llm = llm.with_structured_output(compiled.model)
+            self._touch(self._runnables, runnable_key, structured_llm)
+        else:
+            self._touch(self._runnables, runnable_key)
+
+        return compiled._replace(structured_llm=structured_llm)
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "models": len(self._models),
+            "runnables": len(self._runnables),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        self._models.clear()
+        self._runnables.clear()
+
+
+form_model_cache = FormModelCache()
+
+def create_dynamic_model(api_schema: dict) -> Type[BaseModel]:
+    """Memoized: returns the compiled model for this schema fingerprint."""
+    return form_model_cache.get(api_schema).model
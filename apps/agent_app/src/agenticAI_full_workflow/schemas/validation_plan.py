@@ -0,0 +1,152 @@
+import copy
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .form_schema import schema_fingerprint
+
+# 1. CATEGORY VALIDATION MAP
+VALID_CODES = {
+    "pickup_type_code": ["bp", "dd", "do", "mw", "rp"],
+    "packing_details": ["ps", "pc", "cc", "bwc", "pcc"],
+    "service_level": ["WG", "ROC", "TRHD", "DS"]
+}
+
+def clean_code(val):
+    if isinstance(val, str) and " (" in val:
+        return val.split(" (")[0].strip()
+    return val
+
+
+class ValidationIssue(NamedTuple):
+    code: str  # missing_required | no_items | item_missing_weight | item_missing_quantity | item_missing_dims_or_volume | invalid_code | items_dropped
+    message: str  # Human string (what the Interviewer renders)
+    field: Optional[str] = None
+    item: Optional[int] = None  # 1-based item number
+
+
+class ValidationPlan:
+    """
+    Inspector rules compiled once per schema fingerprint.
+
+    Rules are grouped into "slots" (one per required top-level field, one per
+    item, one per enum domain) and run in the Inspector's reporting order. A full
+    pass is cheap (sub-millisecond for hundreds of items), so nothing is memoized
+    in the checkpoint.
+    """
+
+    def __init__(self, api_schema: dict):
+        self.fingerprint = schema_fingerprint(api_schema)
+        # 2. Required top-level fields (items/quotebasicinfo have specialized checks)
+        self.required_top_level: Tuple[str, ...] = tuple(
+            f["name"] for f in api_schema.get("required_fields", [])
+            if "items" not in f["name"] and "quotebasicinfo" not in f["name"]
+        )
+        # 4. Enum domains, looked up flat or under the quotebasicinfo prefix
+        self.enum_domains: Tuple[Tuple[str, frozenset], ...] = tuple(
+            (field, frozenset(allowed)) for field, allowed in VALID_CODES.items()
+        )
+
+    # --- Rules (one slot each) ---
+    def _check_required(self, name: str, val: Any) -> List[ValidationIssue]:
+        if val is None or str(val).strip() == "":
+            return [ValidationIssue("missing_required", f"{name.replace('_', ' ').title()} is missing.", field=name)]
+        return []
+
+    def _check_item(self, number: int, item: dict) -> List[ValidationIssue]:
+        # Clean the packing code in place (the Inspector always did this)
+        if item.get("packing_details"):
+            item["packing_details"] = clean_code(item["packing_details"])
+
+        issues = []
+        if not item.get("estimated_weight"):
+            issues.append(ValidationIssue("item_missing_weight", f"Item {number}: Weight is missing.", "estimated_weight", number))
+        if not item.get("quantity"):
+            issues.append(ValidationIssue("item_missing_quantity", f"Item {number}: Quantity is missing.", "quantity", number))
+
+        # XOR Logic for Dims/Vol
+        has_vol = item.get("user_cu_feet") or item.get("total_cubic_feet")
+        has_dims = all([item.get("dim_length"), item.get("dim_width"), item.get("dim_height")])
+        if not has_vol and not has_dims:
+            issues.append(ValidationIssue("item_missing_dims_or_volume", f"Item {number}: Dimensions or Volume missing.", "dimensions", number))
+        return issues
+
+    def _check_code(self, field: str, allowed: frozenset, val: Any) -> List[ValidationIssue]:
+        if val:
+            cleaned = clean_code(val)
+            if cleaned not in allowed:
+                return [ValidationIssue("invalid_code", f"Invalid {field}: '{cleaned}'.", field=field)]
+        return []
+
+    # --- Slots ---
+    def _slots(self, data: dict):
+        """Yields each slot's issues in the Inspector's reporting order."""
+        for name in self.required_top_level:
+            yield self._check_required(name, data.get(name))
+
+        items = data.get("items", [])
+        if not items:
+            yield [ValidationIssue("no_items", "Shipment Items details are missing.", field="items")]
+        else:
+            for i, item in enumerate(items):
+                yield self._check_item(i + 1, item)
+
+        for field, allowed in self.enum_domains:
+            yield self._check_code(field, allowed, data.get(field) or data.get(f"quotebasicinfo[].{field}"))
+
+    def validate(self, data: dict) -> List[ValidationIssue]:
+        issues = []
+        for slot_issues in self._slots(data):
+            issues.extend(slot_issues)
+        return issues
+
+    def regressions(self, before: dict, after: dict, allow_removal: bool = False) -> List[ValidationIssue]:
+        """
+        Issues `after` has that `before` did not, ignoring plain gaps on newly added
+        items (the user may not have given those details yet). Used to judge an
+        extraction: invalid codes, fields that went from valid to broken, or
+        items that disappeared while the user did not ask to remove any.
+        """
+        known = {(i.code, i.field, i.item) for i in self.validate(copy.deepcopy(before))}
+        existing_items = len(before.get("items") or [])
+        issues = [
+            issue for issue in self.validate(copy.deepcopy(after))
+            if (issue.code, issue.field, issue.item) not in known
+            and (issue.code == "invalid_code" or issue.item is None or issue.item <= existing_items)
+        ]
+        dropped = existing_items - len(after.get("items") or [])
+        if dropped > 0 and not allow_removal:
+            issues.append(ValidationIssue("items_dropped", f"{dropped} of {existing_items} items were dropped.", field="items"))
+        return issues
+
+
+class ValidationPlanCache:
+    """Bounded LRU of compiled plans keyed by schema fingerprint."""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._plans: "OrderedDict[str, ValidationPlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, api_schema: dict) -> ValidationPlan:
+        fingerprint = schema_fingerprint(api_schema)
+        plan = self._plans.get(fingerprint)
+        if plan is None:
+            self.misses += 1
+            plan = ValidationPlan(api_schema)
+            self._plans[fingerprint] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        else:
+            self.hits += 1
+        self._plans.move_to_end(fingerprint)
+        return plan
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "plans": len(self._plans), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+
+validation_plan_cache = ValidationPlanCache()
@@ -5,13 +5,15 @@ import asyncio
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
+from .http_client import get_http_client
+from shared_core.logger.logging import logger
 
 # 1. Improved .env Loading (Docker & Local Friendly)
 def setup_env():
     # Pehle check karein ke kya hum Docker mein hain ya Environment Variables set hain
     # Agar OPENAI_API_KEY pehle se environment mein hai, toh .env ki zaroorat nahi
     if os.getenv("OPENAI_API_KEY"):
-        print("[INFO]: Environment variables already loaded from System/Docker.")
+        logger.info("Environment variables already loaded from System/Docker.")
         return
 
     current_dir = Path(__file__).resolve().parent
@@ -22,13 +24,13 @@ def setup_env():
         env_file = parent / ".env"
         if env_file.exists():
             load_dotenv(dotenv_path=env_file, override=True)
-            print(f"[INFO]: Loaded environment from {env_file}")
+            logger.info(f"Loaded environment from {env_file}")
             env_found = True
             break
     
     # Agar na system variables milein aur na .env file, toh sirf warning dein (crash na karein)
     if not env_found and not os.getenv("OPENAI_API_KEY"):
-        print("[WARNING]: No .env file found and no environment variables detected.")
+        logger.warning("No .env file found and no environment variables detected.")
 
 # Initialize environment
 setup_env()
@@ -87,7 +89,7 @@ class MetroApiSchemaParser:
             if "basicinfo" in field_name:
                 with open("debug_schema.json", "w") as f:
                     json.dump(nested_info, f, default=str)
-                print("DEBUG: Wrote debug_schema.json")
+                logger.debug("Wrote debug_schema.json")
 
             # Handle allOf (Composition)
             if "allOf" in nested_info:
@@ -117,65 +119,73 @@ class MetroApiSchemaParser:
             fields.append(field_data)
         return fields
 
+    async def fetch_schema_document(self, headers: Optional[Dict[str, str]] = None, timeout: float = 15.0) -> httpx.Response:
+        """Raw GET of the OpenAPI document (supports conditional headers like If-None-Match)."""
+        client = get_http_client()
+        return await client.get(self.schema_url, headers=headers or {}, timeout=timeout)
+
+    def parse_metadata(self, document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Splits the OpenAPI document into Required and Optional fields for the target path."""
+        self.schema_data = document
+
+        path_info = self.schema_data.get("paths", {}).get(self.target_path, {})
+        content = path_info.get("post", {}).get("requestBody", {}).get("content", {})
+        root_schema_ref = content.get("application/json", {}).get("schema", {}).get("$ref")
+        
+        if not root_schema_ref:
+            return {"error": "Root schema not found"}
+
+        root_schema = self._resolve_ref(root_schema_ref)
+        all_fields = self._parse_schema_recursive(root_schema)
+
+        # --- 4. ENFORCE CRITICAL FIELDS (OVERRIDE API) ---
+        # User wants Agent to ASK if these are missing, even if API says optional.
+        CRITICAL_FIELDS = [
+            "quotebasicinfo[].pickup_zip_code",
+            "quotebasicinfo[].delivery_zip_code",
+            "quotebasicinfo[].service_level",
+            "items[].quantity",
+            "items[].estimated_weight",
+            "items[].value_"
+        ]
+        
+        # Logic: Iterate and Force 'required=True'
+        for field in all_fields:
+            # Check exact match or suffix match
+            # e.g. match "pickup_zip_code" if schema is "quotebasicinfo[].pickup_zip_code"
+            if field["name"] in CRITICAL_FIELDS:
+                field["required"] = True
+            # Partial match support if needed?
+            # For now, strict match based on known schema structure.
+            
+            # Also enforce Dims/Vol check at Inspector level (already done),
+            # so we don't strictly require one vs the other here, 
+            # but we do require basic Item info.
+
+        # --- Yahan splitting logic hai ---
+        required_fields = [f for f in all_fields if f['required'] is True]
+        optional_fields = [f for f in all_fields if f['required'] is False]
+
+        return {
+            "endpoint": self.target_path,
+            "method": "POST",
+            "required_fields": required_fields,
+            "optional_fields": optional_fields
+        }
+
     async def get_price_v2_metadata(self) -> Optional[Dict[str, Any]]:
         """Main method to fetch and split fields into Required and Optional."""
         if not self.schema_url:
             return None
 
-        async with httpx.AsyncClient(verify=False) as client:
-            try:
-                response = await client.get(self.schema_url, timeout=15.0)
-                response.raise_for_status()
-                self.schema_data = response.json()
-
-                path_info = self.schema_data.get("paths", {}).get(self.target_path, {})
-                content = path_info.get("post", {}).get("requestBody", {}).get("content", {})
-                root_schema_ref = content.get("application/json", {}).get("schema", {}).get("$ref")
-                
-                if not root_schema_ref:
-                    return {"error": "Root schema not found"}
-
-                root_schema = self._resolve_ref(root_schema_ref)
-                all_fields = self._parse_schema_recursive(root_schema)
-
-                # --- 4. ENFORCE CRITICAL FIELDS (OVERRIDE API) ---
-                # User wants Agent to ASK if these are missing, even if API says optional.
-                CRITICAL_FIELDS = [
-                    "quotebasicinfo[].pickup_zip_code",
-                    "quotebasicinfo[].delivery_zip_code",
-                    "quotebasicinfo[].service_level",
-                    "items[].quantity",
-                    "items[].estimated_weight",
-                    "items[].value_"
-                ]
-                
-                # Logic: Iterate and Force 'required=True'
-                for field in all_fields:
-                    # Check exact match or suffix match
-                    # e.g. match "pickup_zip_code" if schema is "quotebasicinfo[].pickup_zip_code"
-                    if field["name"] in CRITICAL_FIELDS:
-                        field["required"] = True
-                    # Partial match support if needed?
-                    # For now, strict match based on known schema structure.
-                    
-                    # Also enforce Dims/Vol check at Inspector level (already done),
-                    # so we don't strictly require one vs the other here, 
-                    # but we do require basic Item info.
-
-                # --- Yahan splitting logic hai ---
-                required_fields = [f for f in all_fields if f['required'] is True]
-                optional_fields = [f for f in all_fields if f['required'] is False]
-
-                return {
-                    "endpoint": self.target_path,
-                    "method": "POST",
-                    "required_fields": required_fields,
-                    "optional_fields": optional_fields
-                }
-
-            except Exception as e:
-                print(f"[ERROR]: {e}")
-                return None
+        try:
+            response = await self.fetch_schema_document()
+            response.raise_for_status()
+            return self.parse_metadata(response.json())
+
+        except Exception as e:
+            logger.error(f"GetPrice2 schema fetch failed: {e}")
+            return None
 
 # --- Entry Point ---
 async def main():
@@ -0,0 +1,236 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+# pg_try_advisory_lock key: only one replica runs retention at a time
+RETENTION_LOCK_KEY = 0x51554F5445
+# 100-ns intervals between the UUID epoch (1582-10-15) and the Unix epoch
+UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+# Next page of threads after the keyset cursor (walks the primary key, stops after LIMIT threads)
+SELECT_THREAD_PAGE_SQL = """
+SELECT thread_id FROM checkpoints
+WHERE thread_id > %s
+GROUP BY thread_id
+ORDER BY thread_id
+LIMIT %s
+"""
+
+# Newest checkpoint per thread/namespace of the page (index range scans only)
+SELECT_LATEST_SQL = """
+SELECT thread_id, checkpoint_ns, max(checkpoint_id)
+FROM checkpoints
+WHERE thread_id = ANY(%s)
+GROUP BY thread_id, checkpoint_ns
+"""
+
+# Per (thread, namespace): checkpoint ids below `bound` (the older of the latest id and the cutoff id)
+SUPERSEDED_KEYS = """
+unnest(%s::text[], %s::text[], %s::text[]) AS k(thread_id, checkpoint_ns, bound)
+WHERE t.thread_id = k.thread_id AND t.checkpoint_ns = k.checkpoint_ns AND t.checkpoint_id < k.bound
+"""
+
+# Blob versions the deleted checkpoints pointed at that no remaining checkpoint still uses.
+# Only these are removed: a concurrent put writes its new blobs before the checkpoint row
+# that references them, so "unreferenced right now" does not mean "unused".
+DELETE_RELEASED_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs b
+USING unnest(%s::text[], %s::text[], %s::text[], %s::text[]) AS r(thread_id, checkpoint_ns, channel, version)
+WHERE b.thread_id = r.thread_id
+  AND b.checkpoint_ns = r.checkpoint_ns
+  AND b.channel = r.channel
+  AND b.version = r.version
+  AND NOT EXISTS (
+      SELECT 1 FROM checkpoints c
+      WHERE c.thread_id = b.thread_id
+        AND c.checkpoint_ns = b.checkpoint_ns
+        AND c.checkpoint->'channel_versions'->>b.channel = b.version
+  )
+"""
+
+
+def cutoff_checkpoint_id(age_seconds: float) -> str:
+    """
+    Smallest uuid6 checkpoint id created `age_seconds` ago. LangGraph checkpoint
+    ids are uuid6 strings, which sort by creation time, so `checkpoint_id < cutoff`
+    replaces a JSON `ts` cast and stays on the primary key index.
+    """
+    timestamp = int((time.time() - age_seconds) * 1e7) + UUID_EPOCH_OFFSET
+    uuid_int = ((timestamp >> 12) & 0xFFFFFFFFFFFF) << 80 | (timestamp & 0x0FFF) << 64
+    # Version 6 and RFC 4122 variant bits, set by hand (uuid.UUID only accepts versions 1-5 before 3.14)
+    uuid_int |= 0x6 << 76 | 0x2 << 62
+    return str(UUID(int=uuid_int))
+
+
+@dataclass
+class RetentionReport:
+    checkpoints_compacted: int = 0
+    threads_purged: int = 0
+    blobs_deleted: int = 0
+    batches: int = 0
+    skipped: bool = False  # Another replica holds the lock
+    elapsed_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+class CheckpointRetention:
+    """
+    Bounded-batch cleanup of the LangGraph checkpoint tables.
+
+    - Compaction: after `compact_after_seconds`, only the latest checkpoint of a
+      thread is kept (plus the blobs it references). Blobs are only removed
+      when the deleted checkpoints were their last users.
+    - TTL: threads idle longer than `thread_ttl_seconds` are deleted entirely.
+
+    The job walks the threads in primary-key order, `batch_size` threads per
+    batch. Each batch is its own short transaction on a pooled connection (not
+    the checkpointer's lock), with a pause in between so hot tables are never
+    held. Ages are compared on the time-ordered checkpoint ids, so a batch only
+    reads the index ranges of its own threads.
+    """
+
+    def __init__(
+        self,
+        pool,
+        compact_after_seconds: float = 86400,
+        thread_ttl_seconds: float = 30 * 86400,
+        batch_size: int = 500,
+        max_batches_per_run: int = 50,
+        batch_pause_seconds: float = 0.1,
+        interval_seconds: float = 3600,
+    ):
+        self.pool = pool
+        self.compact_after_seconds = compact_after_seconds
+        self.thread_ttl_seconds = thread_ttl_seconds
+        self.batch_size = batch_size
+        self.max_batches_per_run = max_batches_per_run
+        self.batch_pause_seconds = batch_pause_seconds
+        self.interval_seconds = interval_seconds
+        self.last_report: Optional[RetentionReport] = None
+        # Last thread_id handled; a run that hits max_batches_per_run resumes after it
+        self._cursor = ""
+
+    async def _compact(self, conn, latest: List[Tuple[str, str, str]], cutoff_id: str) -> Dict[str, int]:
+        bounds = [(thread_id, ns, min(latest_id, cutoff_id)) for thread_id, ns, latest_id in latest]
+        if not bounds:
+            return {"checkpoints": 0, "blobs": 0}
+        keys = [list(col) for col in zip(*bounds)]
+        await conn.execute(f"DELETE FROM checkpoint_writes t USING {SUPERSEDED_KEYS}", keys)
+        cur = await conn.execute(
+            f"DELETE FROM checkpoints t USING {SUPERSEDED_KEYS} "
+            "RETURNING t.thread_id, t.checkpoint_ns, t.checkpoint->'channel_versions'",
+            keys,
+        )
+        deleted = await cur.fetchall()
+        released = {
+            (thread_id, ns, channel, str(version))
+            for thread_id, ns, versions in deleted
+            for channel, version in (versions or {}).items()
+        }
+        if not released:
+            return {"checkpoints": len(deleted), "blobs": 0}
+        cur = await conn.execute(DELETE_RELEASED_BLOBS_SQL, [list(col) for col in zip(*released)])
+        return {"checkpoints": len(deleted), "blobs": cur.rowcount}
+
+    async def _purge(self, conn, threads: List[str]) -> int:
+        if not threads:
+            return 0
+        for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+            await conn.execute(f"DELETE FROM {table} WHERE thread_id = ANY(%s)", (threads,))
+        return len(threads)
+
+    async def _process_page(self, conn, report: RetentionReport) -> int:
+        """Purges/compacts the next `batch_size` threads in one transaction; returns the page size."""
+        async with conn.transaction():
+            cur = await conn.execute(SELECT_THREAD_PAGE_SQL, (self._cursor, self.batch_size))
+            threads = [r[0] for r in await cur.fetchall()]
+            if not threads:
+                return 0
+            cur = await conn.execute(SELECT_LATEST_SQL, (threads,))
+            latest = await cur.fetchall()
+
+            newest: Dict[str, str] = {}
+            for thread_id, _, latest_id in latest:
+                newest[thread_id] = max(newest.get(thread_id, ""), latest_id)
+            idle = set()
+            if self.thread_ttl_seconds > 0:
+                ttl_cutoff = cutoff_checkpoint_id(self.thread_ttl_seconds)
+                idle = {thread_id for thread_id, latest_id in newest.items() if latest_id < ttl_cutoff}
+                report.threads_purged += await self._purge(conn, sorted(idle))
+
+            if self.compact_after_seconds > 0:
+                active = [row for row in latest if row[0] not in idle]
+                counts = await self._compact(conn, active, cutoff_checkpoint_id(self.compact_after_seconds))
+                report.checkpoints_compacted += counts["checkpoints"]
+                report.blobs_deleted += counts["blobs"]
+
+        self._cursor = threads[-1]
+        return len(threads)
+
+    async def run_once(self) -> RetentionReport:
+        report = RetentionReport()
+        start = time.perf_counter()
+        if self.compact_after_seconds <= 0 and self.thread_ttl_seconds <= 0:
+            self.last_report = report
+            return report
+        async with self.pool.connection() as conn:
+            cur = await conn.execute("SELECT pg_try_advisory_lock(%s)", (RETENTION_LOCK_KEY,))
+            if not (await cur.fetchone())[0]:
+                report.skipped = True
+                logger.info("Checkpoint retention skipped: another process holds the lock.")
+                return report
+            try:
+                while report.batches < self.max_batches_per_run:
+                    page = await self._process_page(conn, report)
+                    report.batches += 1
+                    if page < self.batch_size:
+                        # Reached the end: the next run starts from the first thread again
+                        self._cursor = ""
+                        break
+                    await asyncio.sleep(self.batch_pause_seconds)
+            except Exception as e:
+                logger.error(f"Checkpoint retention failed: {e}")
+                report.errors.append(str(e))
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(%s)", (RETENTION_LOCK_KEY,))
+
+        report.elapsed_seconds = round(time.perf_counter() - start, 3)
+        self.last_report = report
+        logger.info(
+            f"Checkpoint retention: purged {report.threads_purged} threads, compacted "
+            f"{report.checkpoints_compacted} checkpoints, deleted {report.blobs_deleted} blobs "
+            f"in {report.batches} batches ({report.elapsed_seconds}s)."
+        )
+        return report
+
+    async def run_forever(self) -> None:
+        """Scheduled loop for the app lifespan (cancel to stop)."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Checkpoint retention run crashed: {e}")
+
+
+def build_checkpoint_retention(pool) -> Optional[CheckpointRetention]:
+    """From config.yaml `checkpoint_retention`; None when disabled."""
+    settings = ConfigLoader()["checkpoint_retention"] or {}
+    if not settings.get("enabled", True):
+        return None
+    return CheckpointRetention(
+        pool,
+        compact_after_seconds=float(settings.get("compact_after_seconds", 86400)),
+        thread_ttl_seconds=float(settings.get("thread_ttl_seconds", 30 * 86400)),
+        batch_size=int(settings.get("batch_size", 500)),
+        max_batches_per_run=int(settings.get("max_batches_per_run", 50)),
+        batch_pause_seconds=float(settings.get("batch_pause_seconds", 0.1)),
+        interval_seconds=float(settings.get("interval_seconds", 3600)),
+    )
@@ -0,0 +1,351 @@
+"""
+Compact checkpoint storage for the Postgres checkpointer.
+
+- Values are encoded with LangGraph's msgpack serializer (JsonPlusSerializer),
+  then compressed with zstd (optionally with a dictionary trained on our own
+  checkpoints) or zlib when `zstandard` is not installed.
+- `form_schema` (large, identical for every thread) is stored ONCE per content
+  hash in `checkpoint_schema_blobs`; checkpoints only keep a `schema_ref`.
+- Rows written by the stock serializer stay readable (type tags without a
+  codec suffix are decoded as before); `migrate_checkpoints` rewrites them.
+"""
+
+import json
+import zlib
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .model_loader import ConfigLoader
+from .tracing import CLIENT, tracer
+from shared_core.logger.logging import logger
+
+try:
+    import zstandard
+except ImportError:  # Optional: falls back to zlib
+    zstandard = None
+
+SCHEMA_REF_TYPE = "schema_ref"
+# Tags written by the stock serializer (pre-migration rows)
+LEGACY_TYPES = ("msgpack", "json", "pickle")
+
+
+class MissingSchemaBlob(KeyError):
+    """A checkpoint references a form_schema blob this process has not loaded yet."""
+
+
+def is_form_schema(obj: Any) -> bool:
+    return isinstance(obj, dict) and "required_fields" in obj and "optional_fields" in obj
+
+
+def content_hash(obj: Any) -> str:
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_zstd_dictionary(path: Optional[str]):
+    if not path or zstandard is None:
+        return None
+    with open(path, "rb") as f:
+        return zstandard.ZstdCompressionDict(f.read())
+
+
+def train_zstd_dictionary(samples: List[bytes], dict_size: int = 112640) -> bytes:
+    """Trains a zstd dictionary from raw (uncompressed msgpack) checkpoint values."""
+    if zstandard is None:
+        raise RuntimeError("Dictionary training requires the 'zstandard' package.")
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+
+class CompactCheckpointSerializer(SerializerProtocol):
+    """
+    Wraps the stock serializer: `<type>+<codec>` tags mark compressed payloads,
+    `schema_ref` marks a deduplicated form_schema.
+    """
+
+    def __init__(
+        self,
+        serde: Optional[SerializerProtocol] = None,
+        compression: str = "zstd",
+        level: int = 3,
+        min_size: int = 256,
+        zstd_dict=None,
+        dedupe_form_schema: bool = True,
+        previous_zstd_dicts: Sequence[Any] = (),
+    ):
+        self.serde = serde or JsonPlusSerializer()
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed; checkpoint compression falls back to zlib.")
+            compression = "zlib"
+        self.compression = compression
+        self.level = level
+        self.min_size = min_size
+        self.zstd_dict = zstd_dict
+        # codec tag -> dictionary, for reading rows written before a dictionary rotation
+        self.decode_dicts: Dict[str, Any] = {
+            f"zstd.d{d.dict_id()}": d for d in (*previous_zstd_dicts, zstd_dict) if d is not None
+        }
+        self.dedupe_form_schema = dedupe_form_schema
+        # hash -> schema; only hashes already persisted are emitted as refs
+        self.schema_blobs: Dict[str, dict] = {}
+        self._local = threading.local()  # zstd (de)compressors are not thread-safe
+
+    # --- codecs ---
+    @property
+    def _codec(self) -> str:
+        if self.compression == "zstd" and self.zstd_dict is not None:
+            return f"zstd.d{self.zstd_dict.dict_id()}"
+        return self.compression
+
+    def _zstd(self, kind: str, zstd_dict=None):
+        key = f"{kind}_{id(zstd_dict)}"
+        codec = getattr(self._local, key, None)
+        if codec is None:
+            if kind == "c":
+                codec = zstandard.ZstdCompressor(level=self.level, dict_data=zstd_dict)
+            else:
+                codec = zstandard.ZstdDecompressor(dict_data=zstd_dict)
+            setattr(self._local, key, codec)
+        return codec
+
+    def compress(self, data: bytes) -> Tuple[Optional[str], bytes]:
+        if self.compression == "none" or len(data) < self.min_size:
+            return None, data
+        if self.compression == "zstd":
+            return self._codec, self._zstd("c", self.zstd_dict).compress(data)
+        return "zlib", zlib.compress(data, self.level)
+
+    def decompress(self, codec: str, data: bytes) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if codec.startswith("zstd"):
+            if zstandard is None:
+                raise RuntimeError("Checkpoint was written with zstd; install 'zstandard' to read it.")
+            if codec != "zstd":
+                zstd_dict = self.decode_dicts.get(codec)
+                if zstd_dict is None:
+                    raise ValueError(
+                        f"Checkpoint needs zstd dictionary '{codec}', loaded: {sorted(self.decode_dicts) or None}. "
+                        "Add its file to checkpoint_serde.previous_zstd_dictionaries."
+                    )
+                return self._zstd("d", zstd_dict).decompress(data)
+            return self._zstd("d").decompress(data)
+        raise NotImplementedError(f"Unknown checkpoint codec: {codec}")
+
+    # --- form_schema blobs ---
+    def register_schema(self, digest: str, schema: dict) -> None:
+        self.schema_blobs[digest] = schema
+
+    def dumps_raw(self, obj: Any) -> Tuple[str, bytes]:
+        """Compressed encoding without schema dedupe (used for the blob table itself)."""
+        typ, data = self.serde.dumps_typed(obj)
+        codec, data = self.compress(data)
+        return (f"{typ}+{codec}" if codec else typ), data
+
+    # --- SerializerProtocol ---
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        if self.dedupe_form_schema and is_form_schema(obj):
+            digest = content_hash(obj)
+            if digest in self.schema_blobs:
+                return SCHEMA_REF_TYPE, digest.encode("ascii")
+        return self.dumps_raw(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        typ, payload = data
+        if typ == SCHEMA_REF_TYPE:
+            digest = payload.decode("ascii")
+            if digest not in self.schema_blobs:
+                raise MissingSchemaBlob(digest)
+            return self.schema_blobs[digest]
+        if "+" in typ:
+            typ, codec = typ.rsplit("+", 1)
+            payload = self.decompress(codec, payload)
+        return self.serde.loads_typed((typ, payload))
+
+
+class TracedPostgresSaver(AsyncPostgresSaver):
+    """AsyncPostgresSaver with a span around each checkpoint read/write."""
+
+    def _span(self, operation: str, config):
+        configurable = (config or {}).get("configurable", {})
+        return tracer.span(f"checkpoint {operation}", CLIENT, {
+            "db.system": "postgresql",
+            "db.operation": operation,
+            "thread_id": configurable.get("thread_id", ""),
+        })
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        with self._span("put", config):
+            return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = ""):
+        with self._span("put_writes", config) as span:
+            if span is not None:
+                span.set("writes", len(writes))
+            return await super().aput_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config):
+        with self._span("get_tuple", config):
+            return await super().aget_tuple(config)
+
+
+class CompactPostgresSaver(TracedPostgresSaver):
+    """AsyncPostgresSaver that persists form_schema blobs once and stores compact values."""
+
+    SCHEMA_BLOBS_SQL = """
+    CREATE TABLE IF NOT EXISTS checkpoint_schema_blobs (
+        hash TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        blob BYTEA NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );"""
+
+    def __init__(self, conn, serde: Optional[CompactCheckpointSerializer] = None, **kwargs):
+        super().__init__(conn, serde=serde or CompactCheckpointSerializer(), **kwargs)
+
+    async def setup(self) -> None:
+        await super().setup()
+        async with self._cursor() as cur:
+            await cur.execute(self.SCHEMA_BLOBS_SQL)
+        await self.refresh_schema_blobs()
+
+    async def refresh_schema_blobs(self) -> int:
+        """Loads blobs written by other processes since our last refresh."""
+        async with self._cursor() as cur:
+            await cur.execute(
+                "SELECT hash, type, blob FROM checkpoint_schema_blobs WHERE NOT (hash = ANY(%s))",
+                (list(self.serde.schema_blobs),),
+            )
+            rows = await cur.fetchall()
+        for row in rows:
+            self.serde.register_schema(row["hash"], self.serde.loads_typed((row["type"], row["blob"])))
+        return len(rows)
+
+    async def _persist_schemas(self, values: Iterable[Any]) -> None:
+        new = {}
+        for value in values:
+            if self.serde.dedupe_form_schema and is_form_schema(value):
+                digest = content_hash(value)
+                if digest not in self.serde.schema_blobs:
+                    new[digest] = value
+        if not new:
+            return
+        rows = [(digest, *self.serde.dumps_raw(schema)) for digest, schema in new.items()]
+        async with self._cursor(pipeline=True) as cur:
+            await cur.executemany(
+                "INSERT INTO checkpoint_schema_blobs (hash, type, blob) VALUES (%s, %s, %s) ON CONFLICT (hash) DO NOTHING",
+                rows,
+            )
+        # Only after the blob is durable may checkpoints reference it
+        for digest, schema in new.items():
+            self.serde.register_schema(digest, schema)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        await self._persist_schemas(checkpoint["channel_values"].values())
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = ""):
+        await self._persist_schemas(value for _channel, value in writes)
+        return await super().aput_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config):
+        try:
+            return await super().aget_tuple(config)
+        except MissingSchemaBlob:
+            await self.refresh_schema_blobs()
+            return await super().aget_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        await self.refresh_schema_blobs()
+        async for item in super().alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+
+def build_checkpoint_serializer() -> Optional[CompactCheckpointSerializer]:
+    """From config.yaml `checkpoint_serde`; None means the stock serializer."""
+    settings = ConfigLoader()["checkpoint_serde"] or {}
+    if not settings.get("enabled", True):
+        return None
+    zstd_dict = None
+    if settings.get("zstd_dictionary"):
+        try:
+            zstd_dict = load_zstd_dictionary(settings["zstd_dictionary"])
+        except OSError as e:
+            logger.error(f"Could not load zstd dictionary ({e}); compressing without it.")
+    previous = []
+    for path in settings.get("previous_zstd_dictionaries") or []:
+        try:
+            previous.append(load_zstd_dictionary(path))
+        except OSError as e:
+            logger.error(f"Could not load previous zstd dictionary ({e}); rows written with it are unreadable.")
+    return CompactCheckpointSerializer(
+        compression=settings.get("compression", "zstd"),
+        level=int(settings.get("level", 3)),
+        min_size=int(settings.get("min_size_bytes", 256)),
+        zstd_dict=zstd_dict,
+        dedupe_form_schema=settings.get("dedupe_form_schema", True),
+        previous_zstd_dicts=previous,
+    )
+
+
+def build_checkpointer(pool) -> AsyncPostgresSaver:
+    """The checkpointer used by the API and the batch runner."""
+    serde = build_checkpoint_serializer()
+    if serde is None:
+        return TracedPostgresSaver(pool)
+    return CompactPostgresSaver(pool, serde=serde)
+
+
+# --- Migration of rows written before this serializer ---
+MIGRATION_TABLES = {
+    "checkpoint_blobs": ("thread_id", "checkpoint_ns", "channel", "version"),
+    "checkpoint_writes": ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"),
+}
+
+async def migrate_checkpoints(saver: CompactPostgresSaver, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Re-encodes legacy rows (stock msgpack/json) and rows compressed with a
+    previous zstd dictionary with the compact serializer, so old dictionary
+    files can be retired afterwards. Keyset-paginated and idempotent: safe to
+    interrupt and re-run while serving.
+    """
+    serde = saver.serde
+    current_dict_tag = f"%+{serde._codec}" if serde.zstd_dict is not None else ""
+    migrated = {}
+    for table, key in MIGRATION_TABLES.items():
+        cols = ", ".join(key)
+        placeholders = ", ".join(["%s"] * len(key))
+        last = None
+        count = 0
+        while True:
+            after = f"AND ({cols}) > ({placeholders})" if last else ""
+            async with saver._cursor() as cur:
+                await cur.execute(
+                    f"SELECT {cols}, type, blob FROM {table} "
+                    f"WHERE (type = ANY(%s) OR (type LIKE '%%+zstd.d%%' AND type NOT LIKE %s)) {after} ORDER BY {cols} LIMIT %s",
+                    (list(LEGACY_TYPES), current_dict_tag, *(last or ()), batch_size),
+                )
+                rows = await cur.fetchall()
+            if not rows:
+                break
+            last = tuple(rows[-1][c] for c in key)
+
+            values = [serde.loads_typed((row["type"], row["blob"])) for row in rows]
+            await saver._persist_schemas(values)
+            updates = []
+            for row, value in zip(rows, values):
+                typ, blob = serde.dumps_typed(value)
+                if typ != row["type"] or blob != row["blob"]:
+                    updates.append((typ, blob, *(row[c] for c in key)))
+            if updates:
+                where = " AND ".join(f"{c} = %s" for c in key)
+                async with saver._cursor(pipeline=True) as cur:
+                    await cur.executemany(f"UPDATE {table} SET type = %s, blob = %s WHERE {where}", updates)
+            count += len(updates)
+            logger.info(f"Migrated {count} rows in {table}...")
+        migrated[table] = count
+    return migrated
@@ -0,0 +1,126 @@
+"""
+Delta-context builder for the Agent (extraction) node.
+
+Instead of replaying the last N chat messages (acks, long Interviewer prompts,
+re-extracting everything from scratch), the model gets:
+  - a compact JSON of the CURRENT form state,
+  - the open Inspector issues,
+  - the last question we asked (so short answers like "50 lbs" make sense),
+  - only the NEW user message(s) since our last reply.
+Everything is counted against a token budget; optional parts are trimmed first.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from shared_core.logger.logging import logger
+
+# Messages the graph writes itself; never useful as model context
+ACK_MESSAGES = {"Details updated."}
+# Approximate per-message framing overhead of the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class AgentContext(NamedTuple):
+    messages: List[Tuple[str, str]]
+    token_count: int
+    over_budget: bool
+
+
+@lru_cache(maxsize=8)
+def _encoder(model_name: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # BPE files are downloaded on first use; offline hosts fall back to an estimate
+        logger.warning(f"tiktoken encoding unavailable ({e}); estimating token counts.")
+        return None
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o") -> int:
+    encoder = _encoder(model_name)
+    if encoder is None:
+        return max(1, len(text) // 4)  # Rough estimate without tiktoken
+    return len(encoder.encode(text))
+
+
+def compact_form_state(data: Dict[str, Any]) -> str:
+    """Minified JSON without empty values; prefixes kept so keys match the output schema."""
+    def _prune(value):
+        if isinstance(value, dict):
+            return {k: _prune(v) for k, v in value.items() if v not in (None, "", [], {})}
+        if isinstance(value, list):
+            return [_prune(v) for v in value]
+        return value
+    return json.dumps(_prune(data or {}), separators=(",", ":"), default=str)
+
+
+def split_new_turn(messages: List[Any]) -> Tuple[Optional[str], List[str]]:
+    """Returns (last real assistant question, user messages after it)."""
+    new_user: List[str] = []
+    for msg in reversed(messages):
+        kind = getattr(msg, "type", None)
+        content = str(getattr(msg, "content", ""))
+        if kind == "human":
+            new_user.append(content)
+        elif kind == "ai":
+            if content in ACK_MESSAGES:
+                continue
+            return content, list(reversed(new_user))
+    return None, list(reversed(new_user))
+
+
+def build_agent_context(
+    system_prompt: str,
+    extracted_data: Dict[str, Any],
+    missing_fields: List[str],
+    messages: List[Any],
+    token_budget: int = 1500,
+    max_question_chars: int = 600,
+    model_name: str = "gpt-4o",
+) -> AgentContext:
+    """
+    Builds the [system, user] message pair for the extraction call.
+    Trim order when over budget: last question -> open issues. The form state
+    and the new user message are never dropped (the model would lose data).
+    """
+    question, new_user = split_new_turn(messages)
+    if question and len(question) > max_question_chars:
+        question = question[:max_question_chars] + "..."
+    issues = list(missing_fields or [])
+
+    def render() -> Tuple[List[Tuple[str, str]], int]:
+        parts = [
+            "CURRENT FORM (keep these values unless the user changes them):",
+            compact_form_state(extracted_data),
+        ]
+        if issues:
+            parts += ["OPEN ISSUES:", "\n".join(f"- {i}" for i in issues)]
+        if question:
+            parts += ["LAST QUESTION ASKED:", question]
+        parts += ["NEW USER MESSAGE:", "\n".join(new_user) or "(none)"]
+        parts.append("Return the complete updated form, including all items.")
+        context = [("system", system_prompt), ("user", "\n".join(parts))]
+        tokens = sum(count_tokens(text, model_name) + MESSAGE_OVERHEAD_TOKENS for _, text in context)
+        return context, tokens
+
+    context, tokens = render()
+    if tokens > token_budget and question:
+        question = None
+        context, tokens = render()
+    while tokens > token_budget and issues:
+        issues = issues[: len(issues) // 2]
+        context, tokens = render()
+
+    over_budget = tokens > token_budget
+    if over_budget:
+        logger.warning(f"Agent context is {tokens} tokens (budget {token_budget}); form state kept intact.")
+    return AgentContext(context, tokens, over_budget)
@@ -0,0 +1,42 @@
+import httpx
+import importlib.util
+from typing import Optional
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+_client: Optional[httpx.AsyncClient] = None
+
+def _build_client() -> httpx.AsyncClient:
+    settings = ConfigLoader()["http_client"] or {}
+
+    http2 = bool(settings.get("http2", False))
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("http_client.http2 is enabled but 'h2' is not installed. Using HTTP/1.1.")
+        http2 = False
+
+    return httpx.AsyncClient(
+        verify=bool(settings.get("verify_ssl", False)),
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=int(settings.get("max_connections", 20)),
+            max_keepalive_connections=int(settings.get("max_keepalive_connections", 10)),
+            keepalive_expiry=float(settings.get("keepalive_expiry_seconds", 60)),
+        ),
+        timeout=httpx.Timeout(15.0, connect=float(settings.get("connect_timeout_seconds", 5))),
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-level pooled client (keep-alive) for outbound API calls such as the
+    schema fetch. Callers pass per-operation timeouts on each request.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+async def aclose_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,237 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+SETUP_SQL = (
+    """
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL
+)
+""",
+    "CREATE INDEX IF NOT EXISTS llm_response_cache_expires_idx ON llm_response_cache (expires_at)",
+)
+
+UPSERT_SQL = """
+INSERT INTO llm_response_cache (key, value, expires_at)
+VALUES (%s, %s, now() + make_interval(secs => %s))
+ON CONFLICT (key) DO UPDATE
+SET value = EXCLUDED.value, created_at = now(), expires_at = EXCLUDED.expires_at
+"""
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    LangChain passes the serialized message list as `prompt`; `llm_string` holds the
+    model name/params plus bound kwargs (tools / response_format from
+    with_structured_output), so the structured-output schema is part of the key.
+    """
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class MemoryCacheTier:
+    """Per-process LRU with a TTL."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 512, ttl_seconds: float = 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def aget(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        self.set(key, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class PostgresCacheTier:
+    """
+    Shared tier: one row per key in `llm_response_cache`, read by every worker.
+    Errors are logged and treated as misses, so the database never fails an LLM call.
+    Expired rows are deleted every `purge_every` writes.
+    """
+
+    name = "postgres"
+
+    def __init__(self, pool, ttl_seconds: float = 86400, purge_every: int = 500):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._writes = 0
+
+    async def setup(self) -> None:
+        async with self.pool.connection() as conn:
+            for statement in SETUP_SQL:
+                await conn.execute(statement)
+
+    async def aget(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        try:
+            async with self.pool.connection() as conn:
+                cur = await conn.execute(
+                    "SELECT value FROM llm_response_cache WHERE key = %s AND expires_at > now()", (key,)
+                )
+                row = await cur.fetchone()
+            return loads(row[0]) if row else None
+        except Exception as e:
+            logger.warning(f"LLM cache read failed (treated as miss): {e}")
+            return None
+
+    async def aset(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(UPSERT_SQL, (key, dumps(value), self.ttl_seconds))
+                self._writes += 1
+                if self.purge_every and self._writes % self.purge_every == 0:
+                    await conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= now()")
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        # Shared across workers; truncate from SQL if really needed
+        pass
+
+
+class TieredLLMCache(BaseCache):
+    """
+    Exact-match response cache for the ChatOpenAI clients (`cache=` argument).
+
+    Tiers are checked in order; a hit in a later tier is copied into the earlier
+    ones, and new responses are written to all of them. Tiers can be added at
+    runtime (the Postgres tier is attached once the app's pool exists). The sync
+    API only uses tiers that have a sync `get`/`set` (memory).
+    """
+
+    def __init__(self, tiers: Optional[Sequence[Any]] = None):
+        self.tiers: List[Any] = list(tiers or [])
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+
+    def add_tier(self, tier: Any) -> None:
+        self.tiers.append(tier)
+
+    def _record_hit(self, tier_name: str) -> None:
+        self.hits[tier_name] = self.hits.get(tier_name, 0) + 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        for tier in self.tiers:
+            if hasattr(tier, "get"):
+                value = tier.get(key)
+                if value is not None:
+                    self._record_hit(tier.name)
+                    return value
+        self.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        for tier in self.tiers:
+            if hasattr(tier, "set"):
+                tier.set(key, return_val)
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        for index, tier in enumerate(self.tiers):
+            value = await tier.aget(key)
+            if value is not None:
+                self._record_hit(tier.name)
+                for upper in self.tiers[:index]:
+                    await upper.aset(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        for tier in self.tiers:
+            await tier.aset(key, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        memory = next((t for t in self.tiers if isinstance(t, MemoryCacheTier)), None)
+        return {
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": memory.size() if memory else 0,
+            "tiers": [t.name for t in self.tiers],
+        }
+
+
+def _llm_cache_settings() -> Dict[str, Any]:
+    return ConfigLoader()["llm_cache"] or {}
+
+
+def _build_llm_cache() -> Optional[TieredLLMCache]:
+    settings = _llm_cache_settings()
+    if not settings.get("enabled", True):
+        return None
+    return TieredLLMCache([
+        MemoryCacheTier(
+            maxsize=int(settings.get("memory_maxsize", 512)),
+            ttl_seconds=float(settings.get("memory_ttl_seconds", 3600)),
+        )
+    ])
+
+
+# Shared by every ChatOpenAI client from ModelLoader (None when disabled)
+llm_response_cache = _build_llm_cache()
+
+
+async def attach_postgres_llm_cache(pool) -> Optional[PostgresCacheTier]:
+    """Adds the shared Postgres tier (config.yaml `llm_cache.postgres`) once a pool exists."""
+    settings = _llm_cache_settings()
+    if llm_response_cache is None or not settings.get("postgres", True):
+        return None
+    if any(isinstance(t, PostgresCacheTier) for t in llm_response_cache.tiers):
+        return None
+    tier = PostgresCacheTier(pool, ttl_seconds=float(settings.get("postgres_ttl_seconds", 86400)))
+    await tier.setup()
+    llm_response_cache.add_tier(tier)
+    logger.info("LLM Response Cache: Postgres tier attached.")
+    return tier
+
+
+def detach_postgres_llm_cache() -> None:
+    if llm_response_cache is not None:
+        llm_response_cache.tiers = [t for t in llm_response_cache.tiers if not isinstance(t, PostgresCacheTier)]
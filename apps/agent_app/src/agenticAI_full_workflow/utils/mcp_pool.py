@@ -0,0 +1,275 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from .model_loader import ConfigLoader
+from .tracing import trace_env
+from shared_core.logger.logging import logger
+
+
+def resolve_quote_server_dir() -> Optional[str]:
+    """Walks up from this file to the monorepo root and returns mcp_servers/quote_mcp."""
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+    while len(root_dir) > 5 and not os.path.exists(os.path.join(root_dir, "mcp_servers")):
+        parent = os.path.dirname(root_dir)
+        if parent == root_dir:
+            break
+        root_dir = parent
+
+    server_dir = os.path.join(root_dir, "mcp_servers", "quote_mcp")
+    if os.path.exists(os.path.join(server_dir, "server.py")):
+        return server_dir
+    return None
+
+
+def quote_server_params(server_dir: str) -> StdioServerParameters:
+    return StdioServerParameters(
+        command="python",  # Use the python already in your path
+        args=["server.py"],  # Call the script directly
+        cwd=server_dir,
+        env={**os.environ, **trace_env()}  # Server spans go to the agent's trace file
+    )
+
+
+class PooledMCPSession:
+    """
+    One long-lived `python server.py` subprocess with an initialized ClientSession.
+
+    stdio_client/ClientSession are anyio contexts and must be entered and exited
+    in the SAME task, so each session is owned by its own runner task. Borrowers
+    only call methods on `self.session` (safe across tasks).
+    """
+
+    def __init__(self, server_params: StdioServerParameters, slot: int):
+        self.server_params = server_params
+        self.slot = slot
+        self.session: Optional[ClientSession] = None
+        self.error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.slot}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Don't leave a half-started subprocess (and its runner task) behind
+            self._task.cancel()
+            with suppress(BaseException):
+                await self._task
+            raise RuntimeError(f"MCP session {self.slot} did not start within {timeout}s.")
+        if not self.alive:
+            raise RuntimeError(f"MCP session {self.slot} failed to start: {self.error}")
+
+    async def _run(self) -> None:
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except BaseException as e:  # subprocess crash, init failure or cancellation
+            self.error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP session {self.slot} failed health check: {e}")
+            return False
+
+    async def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._task is not None:
+            with suppress(BaseException):
+                await asyncio.wait_for(self._task, timeout=timeout)
+
+
+class MCPSessionPool:
+    """
+    Bounded pool of initialized MCP ClientSessions owned by the app lifespan.
+
+    - `size` subprocesses are spawned once at startup (not per approval).
+    - Borrowers get a healthy session via `async with pool.session() as s`.
+    - Dead/crashed sessions are respawned on borrow and by the health loop.
+    - A session that raises while borrowed is recycled (transport state unknown).
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        size: int = 2,
+        startup_timeout: float = 30.0,
+        call_timeout: float = 60.0,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+    ):
+        self.server_params = server_params
+        self.size = max(1, size)
+        self.startup_timeout = startup_timeout
+        self.call_timeout = call_timeout
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self._idle: "asyncio.Queue[PooledMCPSession]" = asyncio.Queue(maxsize=self.size)
+        self._slots: List[PooledMCPSession] = []
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.respawns = 0
+
+    async def start(self) -> None:
+        self._slots = [PooledMCPSession(self.server_params, slot=i) for i in range(self.size)]
+        results = await asyncio.gather(
+            *(s.start(self.startup_timeout) for s in self._slots), return_exceptions=True
+        )
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if len(failed) == len(results):
+            await self.close()
+            raise RuntimeError(f"MCP pool could not start any session: {failed[0]}")
+        for s in self._slots:
+            # Dead slots are still queued; they are respawned when borrowed
+            self._idle.put_nowait(s)
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-pool-health")
+        logger.info(f"MCP Session Pool Started ({self.size - len(failed)}/{self.size} sessions ready).")
+
+    async def _respawn(self, pooled: PooledMCPSession) -> PooledMCPSession:
+        await pooled.close()
+        fresh = PooledMCPSession(self.server_params, slot=pooled.slot)
+        self._slots[pooled.slot] = fresh
+        self.respawns += 1
+        logger.warning(f"Respawning MCP session {pooled.slot} (previous error: {pooled.error})")
+        await fresh.start(self.startup_timeout)
+        return fresh
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        if self._closed:
+            raise RuntimeError("MCP session pool is closed.")
+        pooled = await self._idle.get()
+        try:
+            if not pooled.alive:
+                try:
+                    pooled = await self._respawn(pooled)
+                except Exception as e:
+                    raise RuntimeError(f"MCP session {pooled.slot} is down and could not be respawned.") from e
+            try:
+                yield pooled.session
+            except Exception:
+                # Unknown transport state: recycle this process on next borrow
+                await pooled.close()
+                raise
+        finally:
+            self._idle.put_nowait(self._slots[pooled.slot])
+
+    async def _health_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            # Only check sessions that are idle right now; never block borrowers
+            for _ in range(self._idle.qsize()):
+                try:
+                    pooled = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                try:
+                    if not await pooled.ping(self.ping_timeout):
+                        pooled = await self._respawn(pooled)
+                except Exception as e:
+                    logger.error(f"MCP session {pooled.slot} respawn failed: {e}")
+                finally:
+                    self._idle.put_nowait(self._slots[pooled.slot])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "alive": sum(1 for s in self._slots if s.alive),
+            "respawns": self.respawns,
+        }
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._health_task:
+            self._health_task.cancel()
+            with suppress(BaseException):
+                await self._health_task
+        await asyncio.gather(*(s.close() for s in self._slots), return_exceptions=True)
+        logger.info("MCP Session Pool Closed.")
+
+
+# Set by the app lifespan; None in standalone runs (CLI), which fall back to one-shot sessions
+quote_mcp_pool: Optional[MCPSessionPool] = None
+
+def set_quote_mcp_pool(pool: Optional[MCPSessionPool]) -> None:
+    global quote_mcp_pool
+    quote_mcp_pool = pool
+
+
+async def start_quote_mcp_pool(size: Optional[int] = None) -> Optional[MCPSessionPool]:
+    """
+    Starts the Quote MCP pool from config.yaml and registers it for the Submitter.
+    Returns None (non-fatal) if the server is missing or no session could start;
+    the Submitter then falls back to a one-shot server per approval.
+    """
+    settings = (ConfigLoader()["mcp"] or {}).get("quote_server", {})
+    server_dir = resolve_quote_server_dir()
+    if not server_dir:
+        logger.warning("Quote MCP server not found. Submitter will report pricing as unavailable.")
+        return None
+
+    pool = MCPSessionPool(
+        quote_server_params(server_dir),
+        size=size or int(settings.get("pool_size", 2)),
+        startup_timeout=float(settings.get("startup_timeout_seconds", 30)),
+        call_timeout=float(settings.get("call_timeout_seconds", 60)),
+        health_check_interval=float(settings.get("health_check_interval_seconds", 30)),
+    )
+    try:
+        await pool.start()
+    except Exception as e:
+        logger.error(f"MCP Session Pool failed to start: {e}")
+        return None
+    set_quote_mcp_pool(pool)
+    return pool
+
+
+def quote_call_timeout() -> timedelta:
+    """Per-call read timeout for Quote MCP tools (`mcp.quote_server.call_timeout_seconds`)."""
+    if quote_mcp_pool is not None:
+        return timedelta(seconds=quote_mcp_pool.call_timeout)
+    settings = (ConfigLoader()["mcp"] or {}).get("quote_server", {})
+    return timedelta(seconds=float(settings.get("call_timeout_seconds", 60)))
+
+
+@asynccontextmanager
+async def quote_mcp_session() -> AsyncIterator[ClientSession]:
+    """Borrows a pooled session if the app owns a pool, else spawns a one-shot server."""
+    if quote_mcp_pool is not None:
+        async with quote_mcp_pool.session() as session:
+            yield session
+        return
+
+    server_dir = resolve_quote_server_dir()
+    if not server_dir:
+        raise FileNotFoundError("Quote Server (mcp_servers/quote_mcp/server.py) not found.")
+
+    async with stdio_client(quote_server_params(server_dir)) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
@@ -0,0 +1,233 @@
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .tracing import tracer
+
+# Seconds; covers sub-ms cache hits up to multi-second LLM / pricing calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricFamily(NamedTuple):
+    """Scrape-time samples from a collector: [(labels, value), ...]."""
+    name: str
+    type: str  # gauge | counter
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, value in self._values.items():
+            yield f"{self.name}{_labels(dict(zip(self.labelnames, key)))} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., sum, count]
+        self._series: Dict[tuple, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[Dict[str, Any]]:
+        """Observes the block's duration; an exception sets status="error" (if that label exists)."""
+        labels = dict(labels)
+        if "status" in self.labelnames:
+            labels.setdefault("status", "ok")
+        start = time.perf_counter()
+        try:
+            yield labels
+        except BaseException:
+            if "status" in self.labelnames:
+                labels["status"] = "error"
+            raise
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, series in self._series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}"
+            yield f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {series[-1]}"
+            yield f"{self.name}_sum{_labels(labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process Prometheus registry (text format 0.0.4).
+
+    Hot paths only touch dicts (no locks, no I/O); gauges for pools and caches
+    are read from their existing stats() at scrape time via collectors.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        families: Dict[str, MetricFamily] = {}
+        for collector in self._collectors:
+            for family in collector():
+                if family.name in families:
+                    families[family.name].samples.extend(family.samples)
+                else:
+                    families[family.name] = MetricFamily(family.name, family.type, family.help, list(family.samples))
+        for family in families.values():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for labels, value in family.samples:
+                lines.append(f"{family.name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+node_duration = metrics.histogram(
+    "agent_node_duration_seconds", "Graph node execution time.", ("node", "status")
+)
+llm_duration = metrics.histogram(
+    "agent_llm_request_duration_seconds", "Chat model call time (cache hits included).", ("model",)
+)
+llm_tokens = metrics.counter(
+    "agent_llm_tokens_total", "LLM tokens by model, kind (prompt/completion) and source (api/cache).", ("model", "kind", "source")
+)
+mcp_duration = metrics.histogram(
+    "agent_mcp_call_duration_seconds", "Quote MCP tool call time.", ("tool", "status")
+)
+
+
+def timed_node(name: str, func: Callable) -> Callable:
+    """
+    Wraps a graph node with a duration histogram and a span (LLM/checkpoint/MCP
+    spans nest under it); functools.wraps keeps the signature LangGraph inspects
+    (e.g. `config`).
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with node_duration.time(node=name), tracer.span(f"node {name}", attributes={"langgraph.node": name}):
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Token usage and latency per model, from LangChain's run callbacks."""
+
+    # Dict updates only: run on the event loop instead of a thread-pool hop
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[Any, Tuple[float, str]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, invocation_params=None, **kwargs) -> None:
+        params = invocation_params or kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), model)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        start, model = self._started.pop(run_id, (None, "unknown"))
+        if start is not None:
+            llm_duration.observe(time.perf_counter() - start, model=model)
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                # LangChain zeroes total_cost on cache hits
+                source = "cache" if usage.get("total_cost") == 0 else "api"
+                llm_tokens.inc(usage.get("input_tokens", 0), model=model, kind="prompt", source=source)
+                llm_tokens.inc(usage.get("output_tokens", 0), model=model, kind="completion", source=source)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._started.pop(run_id, None)
+
+
+llm_metrics_callback = LLMMetricsCallback()
+
+
+def pool_families(name: str, pool) -> List[MetricFamily]:
+    """psycopg_pool AsyncConnectionPool.get_stats() as gauges/counters (cheap, no I/O)."""
+    if pool is None:
+        return []
+    stats = pool.get_stats()
+    labels = {"pool": name}
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return [
+        MetricFamily("agent_db_pool_connections", "gauge", "Connections open in the pool.", [(labels, size)]),
+        MetricFamily("agent_db_pool_in_use", "gauge", "Connections checked out.", [(labels, size - available)]),
+        MetricFamily("agent_db_pool_max", "gauge", "Configured max_size.", [(labels, stats.get("pool_max", 0))]),
+        MetricFamily("agent_db_pool_waiting", "gauge", "Requests waiting for a connection.", [(labels, stats.get("requests_waiting", 0))]),
+        MetricFamily("agent_db_pool_requests_total", "counter", "Connection requests served.", [(labels, stats.get("requests_num", 0))]),
+        MetricFamily("agent_db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection.", [(labels, stats.get("requests_wait_ms", 0) / 1000)]),
+        MetricFamily("agent_db_pool_errors_total", "counter", "Failed connection requests.", [(labels, stats.get("requests_errors", 0))]),
+    ]
+
+
+def cache_families(name: str, hits: int, misses: int) -> List[MetricFamily]:
+    labels = {"cache": name}
+    lookups = hits + misses
+    return [
+        MetricFamily("agent_cache_hits_total", "counter", "Cache hits.", [(labels, hits)]),
+        MetricFamily("agent_cache_misses_total", "counter", "Cache misses.", [(labels, misses)]),
+        MetricFamily("agent_cache_hit_ratio", "gauge", "Hits / lookups since start.", [(labels, hits / lookups if lookups else 0.0)]),
+    ]
@@ -6,14 +6,16 @@ from langchain_openai import ChatOpenAI
 
 # Project modules
 from ..utils.common import read_yaml
+from ..utils.model_router import ModelRouter
 from ..constants import config_path
+from shared_core.logger.logging import logger
 
 # Load environment variables (Optional fail if not found)
 load_dotenv(find_dotenv(), override=True)
 
 class ConfigLoader:
     def __init__(self):
-        print(f"[INFO]: Loading project configuration from {config_path}")
+        logger.info(f"Loading project configuration from {config_path}")
         self.config = read_yaml(config_path)
     
     def __getitem__(self, key):
@@ -49,14 +51,30 @@ class ModelLoader(BaseModel):
             else:
                 model_name = openai_config.get("model_name", "gpt-4o")
             
-            print(f"[INFO]: Initializing OpenAI Model ({model_type}): {model_name}")
+            logger.info(f"Initializing OpenAI Model ({model_type}): {model_name}")
+
+            # Response cache + token/latency metrics + spans (imported here: they need ConfigLoader)
+            from .llm_cache import llm_response_cache
+            from .metrics import llm_metrics_callback
+            from .tracing import llm_tracing_callback
             
             return ChatOpenAI(
                 model=model_name, 
                 api_key=api_key,
+                cache=llm_response_cache,
+                callbacks=[llm_metrics_callback, llm_tracing_callback],
             )
             
         except KeyError as e:
             raise KeyError(f"[ERROR]: Missing key in config.yaml: {str(e)}")
         except Exception as e:
-            raise Exception(f"[ERROR]: Failed to load LLM: {str(e)}")
\ No newline at end of file
+            raise Exception(f"[ERROR]: Failed to load LLM: {str(e)}")
+
+    def load_router(self, task: str) -> ModelRouter:
+        """
+        Cheapest-first model chain for `task` from config.yaml `llm.routing`
+        (e.g. extraction: ["fast", "smart"]); defaults to the smart model only.
+        """
+        routing = (self.config["llm"] or {}).get("routing") or {}
+        model_types = routing.get(task) or ["smart"]
+        return ModelRouter(task, [(model_type, self.load_llm(model_type=model_type)) for model_type in model_types])
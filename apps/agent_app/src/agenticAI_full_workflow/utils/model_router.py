@@ -0,0 +1,106 @@
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from shared_core.logger.logging import logger
+
+
+class RoutedResult(NamedTuple):
+    value: Any
+    route: str  # model_type that produced `value`
+    escalations: int  # how many cheaper routes were tried first
+    reason: Optional[str] = None  # why the last escalation happened
+
+
+class RouteStats:
+    def __init__(self, window: int = 512):
+        self.calls = 0
+        self.accepted = 0
+        self.errors = 0  # exception / unparseable output
+        self.rejected = 0  # parsed, but failed the accept check
+        self.total_ms = 0.0
+        self._recent_ms: deque = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, outcome: str) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self._recent_ms.append(elapsed_ms)
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self._recent_ms)
+        def pct(p: float) -> float:
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 1) if recent else 0.0
+        return {
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+        }
+
+
+class ModelRouter:
+    """
+    Tries models cheapest-first and escalates only when needed.
+
+    `routes` is an ordered list of (model_type, llm). For each request the caller
+    supplies `build(llm) -> runnable` (e.g. a structured-output binding) and
+    `accept(value) -> None | reason`. A route whose call raises (API error,
+    unparseable output) or whose value is rejected hands over to the next one;
+    the last route's value is returned as-is and its errors propagate.
+    """
+
+    def __init__(self, name: str, routes: Sequence[Tuple[str, Any]]):
+        if not routes:
+            raise ValueError(f"[ERROR]: Model router '{name}' has no routes.")
+        self.name = name
+        self.routes: List[Tuple[str, Any]] = list(routes)
+        self.route_stats: Dict[str, RouteStats] = {route: RouteStats() for route, _ in self.routes}
+        self.requests = 0
+        self.escalated = 0
+
+    @property
+    def primary_llm(self) -> Any:
+        return self.routes[0][1]
+
+    async def ainvoke(
+        self,
+        build: Callable[[Any], Any],
+        input: Any,
+        accept: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> RoutedResult:
+        self.requests += 1
+        reason = None
+        last = len(self.routes) - 1
+        for index, (route, llm) in enumerate(self.routes):
+            stats = self.route_stats[route]
+            start = time.perf_counter()
+            try:
+                value = await build(llm).ainvoke(input)
+                if value is None:
+                    raise ValueError("empty structured output")
+            except Exception as e:
+                stats.record((time.perf_counter() - start) * 1000, "errors")
+                if index == last:
+                    raise
+                reason = f"{route} failed: {e}"
+            else:
+                rejection = accept(value) if accept and index < last else None
+                stats.record((time.perf_counter() - start) * 1000, "rejected" if rejection else "accepted")
+                if not rejection:
+                    if index:
+                        self.escalated += 1
+                    return RoutedResult(value, route, index, reason)
+                reason = f"{route} rejected: {rejection}"
+            logger.info(f"[Router: {self.name}] Escalating -> {self.routes[index + 1][0]} ({reason})")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.requests, 3) if self.requests else 0.0,
+            "routes": {route: stats.snapshot() for route, stats in self.route_stats.items()},
+        }
@@ -0,0 +1,207 @@
+"""
+Deterministic pre-extraction (runs BEFORE the LLM in agent_node).
+
+Recognizes the structured bits users usually type verbatim: ZIP codes, weights
+(+units), dimension triples, cubic feet, quantities, declared values and the
+service/packing/pickup code keywords. Output uses the same keys as the dynamic
+StrictNestedFormModel, restricted to fields that exist in the scouted schema.
+
+It is deliberately conservative: anything ambiguous (several weights, several
+dimension sets, "item 2", conflicting code keywords) is left to the LLM.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+KG_TO_LB = 2.20462
+CM_TO_IN = 1 / 2.54
+
+NUM = r"(\d+(?:,\d{3})*(?:\.\d+)?)"
+
+WEIGHT_RE = re.compile(NUM + r"\s*(lbs?|pounds?|kgs?|kilograms?|kilos?)\b", re.I)
+DIMS_RE = re.compile(
+    NUM + r"\s*(?:x|×|\*|by)\s*" + NUM + r"\s*(?:x|×|\*|by)\s*" + NUM
+    + r"\s*(inch(?:es)?|in\b|\"|cm\b|centimet(?:er|re)s?|ft\b|feet)?", re.I
+)
+VOLUME_RE = re.compile(NUM + r"\s*(?:cu\.?\s*ft\.?|cubic\s+f(?:ee|oo)t|cuft|ft3|ft³)", re.I)
+QUANTITY_RE = re.compile(
+    r"(?:\b(?:quantity|qty)\s*[:=]?\s*(\d+)\b)|(?:\b(\d+)\s*(?:x\s+)?(?:items?|pieces?|pcs|boxes|units|cartons|pallets|crates)\b)", re.I
+)
+VALUE_RE = re.compile(
+    r"(?:\$\s*" + NUM + r")|(?:\b(?:declared\s+value|value(?:d)?(?:\s+at)?|worth|insured\s+for)\b[^\d$]{0,15}\$?\s*" + NUM + r")", re.I
+)
+ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+PICKUP_ZIP_RE = re.compile(r"\b(?:pick\s*-?\s*up|from|origin|ship(?:ping)?\s+from)\b[^0-9]{0,25}?\b(\d{5})(?:-\d{4})?\b", re.I)
+DELIVERY_ZIP_RE = re.compile(r"\b(?:deliver(?:y|ed)?|to|destination|dest)\b[^0-9]{0,25}?\b(\d{5})(?:-\d{4})?\b", re.I)
+ITEM_NOUN = r"(?:items?|box(?:es)?|pieces?|packages?|cartons?|crates?|pallets?|units?)"
+MULTI_ITEM_RE = re.compile(
+    r"\bitem\s*#?\s*[2-9]\b|\bitems?\s*\d+\s*[:\-]"
+    r"|\b(?:another|second|2nd|third|3rd|one\s+more|an?\s+additional|an?\s+extra)\s+(?:\w+\s+)?" + ITEM_NOUN + r"\b",
+    re.I,
+)
+# The message corrects the item we already have; explicit correction wording only
+EDIT_ITEM_RE = re.compile(
+    r"\b(?:actually|instead|correction|correct(?:ed)?|change[sd]?|update[sd]?|replace|fix|meant"
+    r"|make\s+it|should\s+(?:be|say|read)|not\s+\d)\b",
+    re.I,
+)
+# The message describes an additional item ("also ship a lamp", "add a 20 lb box", "a chair too")
+NEW_ITEM_RE = re.compile(
+    r"\b(?:add(?:ing|ed)?|also|too|as\s+well|plus|in\s+addition|additionally|another)\b",
+    re.I,
+)
+# The user asks to drop an item ("remove the second box", "delete item 2"): the verb must
+# point at an item, so "drop off at the door" or "cancel the white glove" do not count
+ITEM_REF = r"(?:" + ITEM_NOUN + r"|(?:first|second|2nd|third|3rd|last|other)\s+\w+)"
+REMOVE_ITEM_RE = re.compile(
+    r"\b(?:remove|delete|drop(?!\s*-?\s*off)|cancel|take\s+out|get\s+rid\s+of|no\s+longer\s+(?:need|ship|send))"
+    r"\s+(?:\w+\s+){0,3}?" + ITEM_REF + r"\b"
+    r"|\bwithout\s+(?:the\s+)?(?:\w+\s+)?" + ITEM_NOUN + r"\b",
+    re.I,
+)
+
+CODE_KEYWORDS: Dict[str, List[Tuple[re.Pattern, str]]] = {
+    "service_level": [
+        (re.compile(r"white[\s-]*glove", re.I), "WG"),
+        (re.compile(r"room\s+of\s+choice", re.I), "ROC"),
+        (re.compile(r"threshold", re.I), "TRHD"),
+        (re.compile(r"door[\s-]*step", re.I), "DS"),
+        (re.compile(r"\b(WG|ROC|TRHD|DS)\b"), None),  # Literal code typed by the user
+    ],
+    "packing_details": [
+        (re.compile(r"packed\s*(?:&|and)\s*crated", re.I), "pcc"),
+        (re.compile(r"crated\s+by\s+(?:the\s+)?carrier|carrier[\s-]*crated", re.I), "cc"),
+        (re.compile(r"blanket[\s-]*wrap", re.I), "bwc"),
+        (re.compile(r"packed\s+by\s+(?:the\s+)?carrier|carrier[\s-]*packed", re.I), "pc"),
+        (re.compile(r"packed\s+by\s+(?:the\s+)?shipper|shipper[\s-]*packed|already\s+packed", re.I), "ps"),
+    ],
+    "pickup_type_code": [
+        (re.compile(r"business\s+pick\s*-?\s*up", re.I), "bp"),
+        (re.compile(r"residential\s+pick\s*-?\s*up", re.I), "rp"),
+        (re.compile(r"drop[\s-]*off\s+at\s+(?:the\s+)?(?:metro\s+)?origin", re.I), "do"),
+        (re.compile(r"drop[\s-]*off\s+at\s+(?:the\s+)?(?:metro\s+)?destination", re.I), "dd"),
+        (re.compile(r"metro\s+warehouse", re.I), "mw"),
+    ],
+}
+
+def _num(raw: str) -> float:
+    return float(raw.replace(",", ""))
+
+def _clean(value: float) -> Any:
+    value = round(value, 2)
+    return int(value) if value.is_integer() else value
+
+def _mask(text: str, spans: List[Tuple[int, int]]) -> str:
+    chars = list(text)
+    for start, end in spans:
+        chars[start:end] = " " * (end - start)
+    return "".join(chars)
+
+def _schema_field_map(api_schema: dict) -> Tuple[Dict[str, str], set]:
+    """suffix -> full top-level field name, plus the set of item field names."""
+    top_level, item_fields = {}, set()
+    for f in api_schema.get("required_fields", []) + api_schema.get("optional_fields", []):
+        name = f["name"]
+        if "items[]." in name:
+            item_fields.add(name.replace("items[].", ""))
+        else:
+            top_level[name.split(".")[-1].replace("[]", "")] = name
+    return top_level, item_fields
+
+def _match_code(text: str, field: str) -> Optional[str]:
+    found = set()
+    for pattern, code in CODE_KEYWORDS[field]:
+        for m in pattern.finditer(text):
+            found.add(code or m.group(1))
+    # Conflicting keywords (e.g. "threshold or white glove?") -> let the LLM decide
+    return found.pop() if len(found) == 1 else None
+
+def is_new_item(text: str) -> bool:
+    """True when the message (also) describes an item beyond the ones we have."""
+    return bool(text) and bool(MULTI_ITEM_RE.search(text) or NEW_ITEM_RE.search(text))
+
+def is_item_edit(text: str) -> bool:
+    """True when a single-item message explicitly corrects the existing item rather than adding one."""
+    return bool(text) and not is_new_item(text) and bool(EDIT_ITEM_RE.search(text))
+
+def is_item_removal(text: str) -> bool:
+    return bool(text) and bool(REMOVE_ITEM_RE.search(text))
+
+def pre_extract(text: str, api_schema: dict) -> Dict[str, Any]:
+    """Returns a partial form dict (possibly empty) for the fields found in `text`."""
+    if not text or not api_schema:
+        return {}
+
+    top_level, item_fields = _schema_field_map(api_schema)
+    result: Dict[str, Any] = {}
+    item: Dict[str, Any] = {}
+    consumed: List[Tuple[int, int]] = []
+
+    weights = list(WEIGHT_RE.finditer(text))
+    dims = list(DIMS_RE.finditer(text))
+    volumes = list(VOLUME_RE.finditer(text))
+    values = list(VALUE_RE.finditer(text))
+    quantities = list(QUANTITY_RE.finditer(text))
+    for m in weights + dims + volumes + values + quantities:
+        consumed.append(m.span())
+
+    single_item = (
+        not MULTI_ITEM_RE.search(text)
+        and len(weights) <= 1 and len(dims) <= 1 and len(volumes) <= 1
+        and len(values) <= 1 and len(quantities) <= 1
+    )
+
+    # --- ITEM FIELDS (single-item messages only) ---
+    if single_item:
+        if weights:
+            amount, unit = _num(weights[0].group(1)), weights[0].group(2).lower()
+            if unit.startswith("k"):
+                amount *= KG_TO_LB
+            item["estimated_weight"] = _clean(amount)
+            item["estimated_weight_unit"] = "lb"
+        if dims:
+            unit = (dims[0].group(4) or "in").lower()
+            factor = CM_TO_IN if unit.startswith("c") else 12.0 if unit.startswith("f") else 1.0
+            item["dim_length"], item["dim_width"], item["dim_height"] = (
+                _clean(_num(dims[0].group(i)) * factor) for i in (1, 2, 3)
+            )
+        if volumes:
+            item["user_cu_feet"] = _clean(_num(volumes[0].group(1)))
+        if quantities:
+            item["quantity"] = int(quantities[0].group(1) or quantities[0].group(2))
+        if values:
+            item["value_"] = _clean(_num(values[0].group(1) or values[0].group(2)))
+        packing = _match_code(text, "packing_details")
+        if packing:
+            item["packing_details"] = packing
+
+        item = {k: v for k, v in item.items() if k in item_fields}
+        if item:
+            result["items"] = [item]
+
+    # --- ZIP CODES (mask numbers already used as weights/values/dims first) ---
+    masked = _mask(text, consumed)
+    pickup = PICKUP_ZIP_RE.search(masked)
+    delivery = DELIVERY_ZIP_RE.search(masked)
+    zips = {}
+    if pickup:
+        zips["pickup_zip_code"] = pickup.group(1)
+    if delivery and (not pickup or delivery.group(1) != pickup.group(1)):
+        zips["delivery_zip_code"] = delivery.group(1)
+    if not zips:
+        bare = list(dict.fromkeys(m.group(1) for m in ZIP_RE.finditer(masked)))
+        if len(bare) == 2:
+            # Unlabeled pair: "10001 -> 94105" reads as origin then destination
+            zips = {"pickup_zip_code": bare[0], "delivery_zip_code": bare[1]}
+
+    for suffix, val in zips.items():
+        if suffix in top_level:
+            result[top_level[suffix]] = val
+
+    # --- TOP-LEVEL CODES ---
+    for field in ("service_level", "pickup_type_code"):
+        code = _match_code(text, field)
+        if code and field in top_level:
+            result[top_level[field]] = code
+
+    return result
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .api_loader import MetroApiSchemaParser
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class SchemaCacheEntry:
+    metadata: Dict[str, Any]
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class SchemaCache:
+    """
+    Process-wide cache for the parsed GetPrice2 form schema.
+
+    - Keyed by (schema_url, target_path) so every thread shares one copy.
+    - TTL expiry, revalidated with a conditional GET (ETag / Last-Modified).
+    - Single-flight: a burst of new threads triggers exactly one fetch.
+    - Refresh-ahead: a hit inside the refresh window schedules a background
+      revalidation so callers never wait on an expired entry in steady state.
+    - Serve-stale on upstream errors (only if we already have a copy).
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, refresh_ahead_seconds: float = 300, timeout: float = 15.0):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.timeout = timeout
+        self._entries: Dict[CacheKey, SchemaCacheEntry] = {}
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.fetches = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "fetches": self.fetches,
+        }
+
+    def invalidate(self, schema_url: Optional[str] = None, target_path: Optional[str] = None) -> None:
+        if schema_url is None:
+            self._entries.clear()
+            return
+        self._entries.pop((schema_url, target_path), None)
+
+    async def get_metadata(self, parser: Optional[MetroApiSchemaParser] = None) -> Optional[Dict[str, Any]]:
+        parser = parser or MetroApiSchemaParser()
+        if not parser.schema_url:
+            return None
+
+        key = (parser.schema_url, parser.target_path)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry and now < entry.expires_at:
+            self.hits += 1
+            if now >= entry.expires_at - self.refresh_ahead_seconds and key not in self._inflight:
+                # Refresh in the background; this caller is served from cache
+                task = self._start_load(key, parser)
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return entry.metadata
+
+        self.misses += 1
+        return await asyncio.shield(self._start_load(key, parser))
+
+    def _start_load(self, key: CacheKey, parser: MetroApiSchemaParser) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, parser))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return task
+
+    async def _load(self, key: CacheKey, parser: MetroApiSchemaParser) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            self.fetches += 1
+            response = await parser.fetch_schema_document(headers=headers, timeout=self.timeout)
+
+            if response.status_code == 304 and entry:
+                self.revalidated += 1
+                entry.expires_at = time.monotonic() + self.ttl_seconds
+                logger.info("  >> Schema not modified (304). TTL extended.")
+                return entry.metadata
+
+            response.raise_for_status()
+            document = response.json()
+            # Parsing the full OpenAPI document is CPU work; keep it off the event loop
+            metadata = await asyncio.to_thread(parser.parse_metadata, document)
+            if not metadata or "error" in metadata:
+                logger.error(f"Schema parse failed: {metadata}")
+                return entry.metadata if entry else None
+
+            self._entries[key] = SchemaCacheEntry(
+                metadata=metadata,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            return metadata
+
+        except Exception as e:
+            logger.error(f"Schema fetch failed: {e}")
+            if entry:
+                # Serve stale rather than failing every new conversation
+                logger.warning("  >> Serving stale schema from cache.")
+                return entry.metadata
+            return None
+
+
+def _build_schema_cache() -> SchemaCache:
+    settings = ConfigLoader()["schema_cache"] or {}
+    return SchemaCache(
+        ttl_seconds=float(settings.get("ttl_seconds", 3600)),
+        refresh_ahead_seconds=float(settings.get("refresh_ahead_seconds", 300)),
+        timeout=float(settings.get("timeout_seconds", 15.0)),
+    )
+
+
+# Shared by every thread/request in this process
+schema_cache = _build_schema_cache()
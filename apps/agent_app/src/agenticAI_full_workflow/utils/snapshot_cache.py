@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .model_loader import ConfigLoader
+
+
+@dataclass
+class ThreadSnapshot:
+    values: Dict[str, Any]
+    next: Tuple[str, ...]
+    cached_at: float
+
+
+class ThreadSnapshotCache:
+    """
+    In-process, write-through LRU of the latest state per thread.
+
+    The API writes the state it gets back from each run here, so the next turn's
+    "is this a new thread / is it paused at Review_Gate?" check needs no
+    checkpoint read. Entries are dropped before every write to the thread and
+    expire after `ttl_seconds`, which bounds staleness if another replica
+    served the thread in between.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, ThreadSnapshot]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, thread_id: str) -> Optional[ThreadSnapshot]:
+        entry = self._entries.get(thread_id)
+        if entry is None or time.monotonic() - entry.cached_at > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[thread_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(thread_id)
+        self.hits += 1
+        return entry
+
+    def put(self, thread_id: str, values: Dict[str, Any], next_nodes) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[thread_id] = ThreadSnapshot(values, tuple(next_nodes or ()), time.monotonic())
+        self._entries.move_to_end(thread_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, thread_id: str) -> None:
+        self._entries.pop(thread_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "maxsize": self.maxsize}
+
+
+def _build_snapshot_cache() -> ThreadSnapshotCache:
+    settings = ConfigLoader()["thread_cache"] or {}
+    return ThreadSnapshotCache(
+        maxsize=int(settings.get("maxsize", 1024)),
+        ttl_seconds=float(settings.get("ttl_seconds", 300)),
+    )
+
+
+# Shared by every request in this process
+thread_snapshot_cache = _build_snapshot_cache()
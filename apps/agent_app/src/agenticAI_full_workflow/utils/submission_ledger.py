@@ -0,0 +1,142 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+SETUP_SQL = (
+    """
+CREATE TABLE IF NOT EXISTS quote_submissions (
+    thread_id TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (thread_id, payload_hash)
+)
+""",
+    """
+CREATE INDEX IF NOT EXISTS quote_submissions_thread_updated_idx
+    ON quote_submissions (thread_id, updated_at DESC)
+""",
+)
+
+# Inserts a pending row, or takes over a failed / stale pending one; returns nothing if someone else owns it
+CLAIM_SQL = """
+INSERT INTO quote_submissions (thread_id, payload_hash, status)
+VALUES (%s, %s, 'pending')
+ON CONFLICT (thread_id, payload_hash) DO UPDATE
+SET status = 'pending', result = NULL, attempts = quote_submissions.attempts + 1, updated_at = now()
+WHERE quote_submissions.status = 'failed'
+   OR (quote_submissions.status = 'pending'
+       AND quote_submissions.updated_at < now() - make_interval(secs => %s))
+RETURNING status
+"""
+
+SELECT_ONE_SQL = """
+SELECT thread_id, payload_hash, status, result, attempts
+FROM quote_submissions WHERE thread_id = %s AND payload_hash = %s
+"""
+
+SELECT_LATEST_SQL = """
+SELECT thread_id, payload_hash, status, result, attempts
+FROM quote_submissions WHERE thread_id = %s AND status = 'succeeded'
+ORDER BY updated_at DESC LIMIT 1
+"""
+
+FINISH_SQL = """
+UPDATE quote_submissions SET status = %s, result = %s, updated_at = now()
+WHERE thread_id = %s AND payload_hash = %s
+"""
+
+
+@dataclass
+class SubmissionRecord:
+    thread_id: str
+    payload_hash: str
+    status: str
+    result: Optional[str]
+    attempts: int
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """Stable hash of the API payload (key order and whitespace do not matter)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SubmissionLedger:
+    """
+    Postgres ledger of quote submissions, keyed by (thread_id, payload hash).
+
+    The Submitter claims a row before calling the Quote MCP server and stores the
+    outcome afterwards, so a repeated approval (double-click, proxy retry, batch
+    resume) replays the stored result instead of hitting GetPrice again. Failed
+    submissions, and pending ones older than `pending_timeout_seconds` (crashed
+    worker), can be claimed again.
+    """
+
+    def __init__(self, pool, pending_timeout_seconds: float = 300):
+        self.pool = pool
+        self.pending_timeout_seconds = pending_timeout_seconds
+        self.replays = 0
+
+    async def setup(self) -> None:
+        async with self.pool.connection() as conn:
+            for statement in SETUP_SQL:
+                await conn.execute(statement)
+
+    async def claim(self, thread_id: str, digest: str) -> Tuple[bool, Optional[SubmissionRecord]]:
+        """(True, None) if the caller should submit; else (False, existing record)."""
+        async with self.pool.connection() as conn:
+            cur = await conn.execute(CLAIM_SQL, (thread_id, digest, self.pending_timeout_seconds))
+            if await cur.fetchone():
+                return True, None
+            cur = await conn.execute(SELECT_ONE_SQL, (thread_id, digest))
+            row = await cur.fetchone()
+        self.replays += 1
+        return False, SubmissionRecord(*row) if row else None
+
+    async def finish(self, thread_id: str, digest: str, succeeded: bool, result: str) -> None:
+        async with self.pool.connection() as conn:
+            await conn.execute(FINISH_SQL, (SUCCEEDED if succeeded else FAILED, result, thread_id, digest))
+
+    async def latest(self, thread_id: str) -> Optional[SubmissionRecord]:
+        """Most recent successful submission of the thread (used by /approve replays)."""
+        async with self.pool.connection() as conn:
+            cur = await conn.execute(SELECT_LATEST_SQL, (thread_id,))
+            row = await cur.fetchone()
+        return SubmissionRecord(*row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        return {"replays": self.replays}
+
+
+submission_ledger: Optional[SubmissionLedger] = None
+
+def set_submission_ledger(ledger: Optional[SubmissionLedger]) -> None:
+    global submission_ledger
+    submission_ledger = ledger
+
+def get_submission_ledger() -> Optional[SubmissionLedger]:
+    return submission_ledger
+
+
+async def start_submission_ledger(pool) -> Optional[SubmissionLedger]:
+    """Creates the ledger table from config.yaml `submission_ledger` and registers it for the Submitter."""
+    settings = ConfigLoader()["submission_ledger"] or {}
+    if not settings.get("enabled", True):
+        return None
+    ledger = SubmissionLedger(pool, pending_timeout_seconds=float(settings.get("pending_timeout_seconds", 300)))
+    await ledger.setup()
+    set_submission_ledger(ledger)
+    logger.info("Submission Ledger Ready.")
+    return ledger
@@ -0,0 +1,185 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from psycopg_pool import PoolTimeout
+
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+
+def new_thread_id() -> str:
+    """Collision-free session id (time-based ids collide within the same second)."""
+    return f"session_{uuid.uuid4().hex}"
+
+
+class ThreadBusyError(Exception):
+    """The thread is being processed by another request and the wait timed out."""
+
+
+class RequestIdReusedError(Exception):
+    """An X-Request-ID came back with a different request body."""
+
+
+class ThreadLockManager:
+    """
+    Serializes work per thread_id.
+
+    - In-process: one asyncio.Lock per active thread (dropped when nobody holds/waits).
+    - Across workers/replicas (optional): a session-level Postgres advisory lock on
+      hashtextextended(thread_id), held on a connection from a small dedicated
+      pool so lock holders never starve the checkpointer's pool. Waiters only
+      borrow a connection for each poll, so the pool is sized by the number of
+      threads held at once; a full pool is reported as ThreadBusyError (409).
+    """
+
+    def __init__(self, advisory_pool=None, acquire_timeout: float = 120.0, poll_interval: float = 0.1):
+        self.advisory_pool = advisory_pool
+        self.acquire_timeout = acquire_timeout
+        self.poll_interval = poll_interval
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self.waits = 0
+
+    def _ref(self, thread_id: str) -> asyncio.Lock:
+        lock, users = self._locks.get(thread_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[thread_id] = (lock, users + 1)
+        return lock
+
+    def _unref(self, thread_id: str) -> None:
+        lock, users = self._locks[thread_id]
+        if users <= 1:
+            del self._locks[thread_id]
+        else:
+            self._locks[thread_id] = (lock, users - 1)
+
+    async def _advisory_acquire(self, thread_id: str, deadline: float):
+        """
+        Polls for the advisory lock until `deadline`; returns the connection that holds it.
+        Between polls the connection goes back to the pool, so waiters do not tie it up.
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ThreadBusyError(thread_id)
+            try:
+                conn = await self.advisory_pool.getconn(timeout=remaining)
+            except PoolTimeout:
+                raise ThreadBusyError(thread_id) from None
+            try:
+                cur = await conn.execute("SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", (thread_id,))
+                acquired = (await cur.fetchone())[0]
+            except BaseException:
+                await self.advisory_pool.putconn(conn)
+                raise
+            if acquired:
+                return conn
+            await self.advisory_pool.putconn(conn)
+            if time.monotonic() >= deadline:
+                raise ThreadBusyError(thread_id)
+            await asyncio.sleep(self.poll_interval)
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        lock = self._ref(thread_id)
+        try:
+            if lock.locked():
+                self.waits += 1
+                logger.info(f"[Thread: {thread_id}] Waiting for in-flight request on the same thread...")
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise ThreadBusyError(thread_id) from None
+            try:
+                if self.advisory_pool is None:
+                    yield
+                    return
+                conn = await self._advisory_acquire(thread_id, deadline)
+                try:
+                    yield
+                finally:
+                    try:
+                        await conn.execute("SELECT pg_advisory_unlock(hashtextextended(%s, 0))", (thread_id,))
+                    finally:
+                        await self.advisory_pool.putconn(conn)
+            finally:
+                lock.release()
+        finally:
+            self._unref(thread_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {"active_threads": len(self._locks), "waits": self.waits}
+
+
+class RequestCoalescer:
+    """
+    De-duplicates requests by key (endpoint + X-Request-ID + thread).
+
+    A duplicate that arrives while the first is running awaits the same task;
+    one that arrives shortly after gets the cached result (client retries after
+    a timeout). The work runs in its own task, so a disconnecting first caller
+    does not cancel it for the others. A duplicate is only a duplicate if its
+    body fingerprint matches; a reused id with another body raises
+    RequestIdReusedError instead of returning someone else's answer.
+    """
+
+    def __init__(self, result_ttl_seconds: float = 60.0, max_results: int = 1024):
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_results = max_results
+        self._inflight: Dict[Hashable, Tuple[asyncio.Task, Optional[str]]] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any, Optional[str]]]" = OrderedDict()
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[Any]], fingerprint: Optional[str] = None) -> Any:
+        cached = self._results.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] <= self.result_ttl_seconds:
+                if cached[2] != fingerprint:
+                    raise RequestIdReusedError(key)
+                self.coalesced += 1
+                return cached[1]
+            del self._results[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            task, running_fingerprint = inflight
+            if running_fingerprint != fingerprint:
+                raise RequestIdReusedError(key)
+            self.coalesced += 1
+            logger.info(f"Coalescing duplicate request {key}")
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(work())
+        self._inflight[key] = (task, fingerprint)
+        task.add_done_callback(lambda t: self._finish(key, t, fingerprint))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task, fingerprint: Optional[str]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return  # Failures are not replayed; a retry runs again
+        self._results[key] = (time.monotonic(), task.result(), fingerprint)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": len(self._inflight), "cached_results": len(self._results), "coalesced": self.coalesced}
+
+
+def thread_lock_settings() -> Dict[str, Any]:
+    return ConfigLoader()["thread_locks"] or {}
+
+
+def _build_request_coalescer() -> RequestCoalescer:
+    settings = thread_lock_settings()
+    return RequestCoalescer(result_ttl_seconds=float(settings.get("request_result_ttl_seconds", 60)))
+
+
+# Shared by every request in this process
+request_coalescer = _build_request_coalescer()
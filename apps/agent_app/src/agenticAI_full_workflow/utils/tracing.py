@@ -0,0 +1,278 @@
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .model_loader import ConfigLoader
+from shared_core.logger.logging import logger
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: int = INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value for this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """'00-<trace_id>-<span_id>-<flags>' -> (trace_id, span_id, sampled); None if malformed."""
+    parts = (header or "").strip().lower().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = int(parts[3], 16) & 1
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(sampled)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    entry = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        entry["parentSpanId"] = span.parent_id
+    return entry
+
+
+class JsonFileSpanExporter:
+    """
+    Writes finished spans as OTLP/JSON `ExportTraceServiceRequest` lines (one
+    batch per line) from a background thread, so no collector is needed and the
+    event loop never waits on disk. Each line is a single O_APPEND write, so the
+    Quote MCP server can append its spans to the same file.
+    """
+
+    def __init__(self, path: str, service_name: str, batch_size: int = 256, flush_interval: float = 1.0):
+        self.path = os.path.abspath(path)
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._stopped = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def _write(self, spans: List[Span]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "agenticAI_full_workflow"}, "spans": [_otlp_span(s) for s in spans]}],
+            }]
+        }
+        line = (json.dumps(request, default=str) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    if batch:
+                        self._write(batch)
+                    return
+                batch.append(item)
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError as e:
+                    logger.warning(f"Trace export failed ({len(batch)} spans dropped): {e}")
+
+    def shutdown(self) -> None:
+        if not self._stopped:
+            self._stopped = True
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+# Marks an unsampled trace so its children are not recorded either
+_UNSAMPLED = object()
+
+
+class Tracer:
+    """
+    Minimal span tracer: contextvars for parent/child links, W3C traceparent for
+    crossing process boundaries (HTTP in, MCP out), sampling decided at the root.
+    """
+
+    def __init__(self, exporter: Optional[JsonFileSpanExporter] = None, sample_ratio: float = 1.0):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(self, name: str, kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+                   traceparent: Optional[str] = None) -> Optional[Span]:
+        """Starts a span under the current one (or the remote parent) without activating it."""
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return None
+        if isinstance(parent, Span):
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            remote = parse_traceparent(traceparent)
+            if remote:
+                # The caller's sampling decision wins over our own ratio
+                trace_id, parent_id, sampled = remote
+                if not sampled:
+                    return None
+            elif random.random() < self.sample_ratio:
+                trace_id, parent_id = secrets.token_hex(16), None
+            else:
+                return None
+        return Span(trace_id, secrets.token_hex(8), parent_id, name, kind, attributes=dict(attributes or {}))
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+             traceparent: Optional[str] = None) -> Iterator[Optional[Span]]:
+        """Activates a child span for the block (None when tracing is off or unsampled)."""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, kind, attributes, traceparent)
+        token = _current_span.set(span if span is not None else _UNSAMPLED)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            span = None
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def current_traceparent(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.traceparent if isinstance(span, Span) else None
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """One CLIENT span per chat model call, parented to the active node span."""
+
+    run_inline = True
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._spans: Dict[Any, Span] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, invocation_params=None, **kwargs) -> None:
+        params = invocation_params or kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "unknown"
+        span = self.tracer.start_span(f"llm {model}", CLIENT, {"gen_ai.request.model": model})
+        if span is not None:
+            self._spans[run_id] = span
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                if usage:
+                    span.set("gen_ai.usage.input_tokens", usage.get("input_tokens", 0))
+                    span.set("gen_ai.usage.output_tokens", usage.get("output_tokens", 0))
+                    span.set("llm.cache_hit", usage.get("total_cost") == 0)
+        self.tracer.end_span(span)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self.tracer.end_span(self._spans.pop(run_id, None), error)
+
+
+def tracing_settings() -> Dict[str, Any]:
+    return ConfigLoader()["tracing"] or {}
+
+
+def _build_tracer() -> Tracer:
+    settings = tracing_settings()
+    if not settings.get("enabled", False):
+        return Tracer()
+    exporter = JsonFileSpanExporter(
+        settings.get("export_path", "logs/traces.jsonl"),
+        service_name=settings.get("service_name", "agent_app"),
+    )
+    return Tracer(exporter, sample_ratio=float(settings.get("sample_ratio", 1.0)))
+
+
+def trace_env() -> Dict[str, str]:
+    """Env for the Quote MCP subprocess: same on/off switch and the same (absolute) file."""
+    if not tracer.enabled:
+        return {"TRACE_ENABLED": "false"}
+    return {"TRACE_ENABLED": "true", "TRACE_EXPORT_PATH": tracer.exporter.path}
+
+
+# Shared by every request in this process
+tracer = _build_tracer()
+llm_tracing_callback = LLMTracingCallback(tracer)
@@ -52,12 +52,16 @@ async def run_interactive():
 
     # Use AsyncConnectionPool for efficient connections
     # from psycopg_pool import AsyncConnectionPool # Not needed if using from_conn_string
-    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from agenticAI_full_workflow.utils.checkpoint_serde import CompactPostgresSaver, TracedPostgresSaver, build_checkpoint_serializer
 
     print("[INIT]: Connecting to PostgreSQL...")
-    
+
+    # Same checkpoint encoding as the API, so threads are readable from both
+    serde = build_checkpoint_serializer()
+    saver_cls = CompactPostgresSaver if serde else TracedPostgresSaver
+
     # Use context manager to manage pool automatically
-    async with AsyncPostgresSaver.from_conn_string(postgres_url) as checkpointer:
+    async with saver_cls.from_conn_string(postgres_url, serde=serde) as checkpointer:
         
         # Ensure tables exist
         await checkpointer.setup()
@@ -1,13 +1,25 @@
 import sys
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
-from src.tools.getprice_tool import test_connection, generate_quote
+from src.tools.getprice_tool import test_connection, generate_quote, generate_quotes_batch
+from src.utils.http_client import get_http_client, aclose_http_client
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    # One pooled HTTP client for the life of the server process
+    get_http_client()
+    try:
+        yield
+    finally:
+        await aclose_http_client()
 
 # Initialize FastMCP Server
-mcp = FastMCP("Furniture Quote Server")
+mcp = FastMCP("Furniture Quote Server", lifespan=server_lifespan)
 
 # Register Tools
 mcp.tool(name="test_connection")(test_connection)
 mcp.tool(name="generate_quote")(generate_quote)
+mcp.tool(name="generate_quotes_batch")(generate_quotes_batch)
 
 if __name__ == "__main__":
     mcp.run()
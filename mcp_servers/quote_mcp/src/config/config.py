@@ -10,5 +10,33 @@ API_USERNAME = os.getenv("QUOTE_API_USERNAME")
 API_PASSWORD = os.getenv("QUOTE_API_PASSWORD")
 GET_PRICE_API = os.getenv("GET_PRICE_API")
 
+# Token cache: used when the JWT has no `exp` claim; refresh this many seconds early
+TOKEN_TTL_SECONDS = float(os.getenv("QUOTE_TOKEN_TTL_SECONDS") or 1800)
+TOKEN_REFRESH_SKEW_SECONDS = float(os.getenv("QUOTE_TOKEN_REFRESH_SKEW_SECONDS") or 60)
+
+# Shared HTTP client (connection pool / keep-alive) and per-operation timeouts
+HTTP_MAX_CONNECTIONS = int(os.getenv("QUOTE_HTTP_MAX_CONNECTIONS") or 20)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("QUOTE_HTTP_MAX_KEEPALIVE") or 10)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("QUOTE_HTTP_KEEPALIVE_EXPIRY") or 60)
+HTTP_ENABLE_HTTP2 = (os.getenv("QUOTE_HTTP2") or "false").lower() in ("1", "true", "yes")
+HTTP_CONNECT_TIMEOUT = float(os.getenv("QUOTE_HTTP_CONNECT_TIMEOUT") or 5)
+LOGIN_TIMEOUT = float(os.getenv("QUOTE_LOGIN_TIMEOUT") or 10)
+QUOTE_TIMEOUT = float(os.getenv("QUOTE_REQUEST_TIMEOUT") or 30)
+
+# Quote result cache (in-memory LRU + optional SQLite tier; empty path disables disk)
+QUOTE_CACHE_ENABLED = (os.getenv("QUOTE_CACHE_ENABLED") or "true").lower() in ("1", "true", "yes")
+QUOTE_CACHE_TTL_SECONDS = float(os.getenv("QUOTE_CACHE_TTL_SECONDS") or 300)
+QUOTE_CACHE_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES") or 512)
+QUOTE_CACHE_SQLITE_PATH = os.getenv("QUOTE_CACHE_SQLITE_PATH") or None
+
+# Batch pricing tool limits
+BATCH_MAX_CONCURRENCY = int(os.getenv("QUOTE_BATCH_MAX_CONCURRENCY") or 5)
+BATCH_MAX_ITEMS = int(os.getenv("QUOTE_BATCH_MAX_ITEMS") or 500)
+
+# Trace spans (the agent sets these when it starts the server; same file as its own spans)
+TRACE_ENABLED = (os.getenv("TRACE_ENABLED") or "false").lower() in ("1", "true", "yes")
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH") or "logs/traces.jsonl"
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME") or "quote_mcp"
+
 if not GET_PRICE_API:
     raise ValueError("GET_PRICE_API is missing from .env")
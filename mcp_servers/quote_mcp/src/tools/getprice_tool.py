@@ -1,6 +1,13 @@
 import sys
+import json
+import asyncio
+from typing import List, Optional, Tuple
+from mcp.server.fastmcp import Context
+from ..config.config import BATCH_MAX_CONCURRENCY, BATCH_MAX_ITEMS
 from ..utils.quote_service import fetch_quote_from_api
-from ..utils.auth_service import login_and_get_token
+from ..utils.quote_cache import quote_cache, is_error_result
+from ..utils.auth_service import login_and_get_token, token_manager
+from ..utils.tracing import SERVER, span
 
 async def test_connection() -> str:
     """
@@ -14,7 +21,7 @@ async def test_connection() -> str:
     else:
         return "FAILURE: Could not log in. Check server logs for details."
 
-async def generate_quote(data: dict) -> str:
+async def generate_quote(data: dict, ctx: Context = None) -> str:
     """
     Generates a quote by forwarding the provided JSON payload to the API.
     The server handles authentication automatically.
@@ -24,5 +31,85 @@ async def generate_quote(data: dict) -> str:
     """
     print(f"[INFO] Received Quote Request. Payload keys: {list(data.keys())}", file=sys.stderr)
 
-    # Call API Service directly with the data
-    return await fetch_quote_from_api(data)
+    # The agent sends its span's traceparent in the request _meta
+    with span("tool generate_quote", SERVER, {"rpc.system": "mcp", "rpc.method": "generate_quote"}, traceparent=_traceparent(ctx)) as attrs:
+        if quote_cache is None:
+            result, _status = await fetch_quote_from_api(data)
+        else:
+            result, cache_status = await _quote(data)
+            print(f"[INFO] Quote cache: {cache_status}", file=sys.stderr)
+            if attrs is not None:
+                attrs["quote.cache_status"] = cache_status
+            result = _with_cache_status(result, cache_status)
+        if attrs is not None and is_error_result(result):
+            attrs["error"] = "Quote service returned an error"
+        return result
+
+def _traceparent(ctx: Optional[Context]) -> Optional[str]:
+    try:
+        meta = ctx.request_context.meta if ctx is not None else None
+    except ValueError:  # Called outside a request
+        return None
+    return getattr(meta, "traceparent", None) if meta is not None else None
+
+async def generate_quotes_batch(payloads: List[dict], max_concurrency: Optional[int] = None) -> str:
+    """
+    Generates quotes for many payloads in one call.
+    Payloads are priced concurrently (bounded) over the shared HTTP client with one auth token.
+    Results are returned in INPUT order; one failing item never fails the batch.
+
+    Args:
+        payloads: List of full JSON payloads required by the Quote API.
+        max_concurrency: Optional cap on parallel upstream calls (server limit still applies).
+    """
+    if len(payloads) > BATCH_MAX_ITEMS:
+        return json.dumps({"error": f"Batch too large: {len(payloads)} items (max {BATCH_MAX_ITEMS})."})
+
+    limit = max(1, min(max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    print(f"[INFO] Received Batch Quote Request: {len(payloads)} items (concurrency={limit})", file=sys.stderr)
+
+    # Log in once up front so the fan-out shares the cached token instead of racing
+    if not await token_manager.get_token():
+        return json.dumps({"error": "Could not authenticate with Quote Service."})
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def price_one(index: int, payload) -> dict:
+        async with semaphore:
+            try:
+                if not isinstance(payload, dict):
+                    raise ValueError("Payload must be a JSON object.")
+                result, cache_status = await _quote(payload)
+                parsed = json.loads(result)
+                if isinstance(parsed, dict) and "error" in parsed:
+                    return {"index": index, "status": "error", "error": parsed["error"]}
+                return {"index": index, "status": "ok", "result": parsed, "cache_status": cache_status}
+            except Exception as e:
+                return {"index": index, "status": "error", "error": str(e)}
+
+    results = await asyncio.gather(*(price_one(i, p) for i, p in enumerate(payloads)))
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    return json.dumps({
+        "count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }, indent=2)
+
+async def _quote(data: dict) -> Tuple[str, str]:
+    if quote_cache is None:
+        result, _status = await fetch_quote_from_api(data)
+        return result, "disabled"
+    # Identical payloads are served from cache / coalesced into one upstream call
+    return await quote_cache.get_or_fetch(data, fetch_quote_from_api)
+
+def _with_cache_status(result: str, cache_status: str) -> str:
+    try:
+        parsed = json.loads(result)
+    except Exception:
+        return result
+    if isinstance(parsed, dict):
+        parsed["cache_status"] = cache_status
+    else:
+        parsed = {"result": parsed, "cache_status": cache_status}
+    return json.dumps(parsed, indent=2)
@@ -1,6 +1,13 @@
 import httpx
 import sys
-from ..config.config import API_BASE_URL, API_USERNAME, API_PASSWORD
+import json
+import time
+import base64
+import asyncio
+from typing import Optional
+from ..config.config import API_BASE_URL, API_USERNAME, API_PASSWORD, TOKEN_TTL_SECONDS, TOKEN_REFRESH_SKEW_SECONDS, LOGIN_TIMEOUT
+from .http_client import get_http_client
+from .tracing import CLIENT, span
 
 async def login_and_get_token():
     """
@@ -12,21 +19,89 @@ async def login_and_get_token():
         "password": API_PASSWORD
     }
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(login_url, json=payload, timeout=10.0)
+    client = get_http_client()
+    try:
+        with span("POST SignInAsync", CLIENT, {"http.request.method": "POST", "url.full": login_url}) as attrs:
+            response = await client.post(login_url, json=payload, timeout=LOGIN_TIMEOUT)
+            if attrs is not None:
+                attrs["http.response.status_code"] = response.status_code
             response.raise_for_status()
-            
-            data = response.json()
-            # Try common token keys
-            token = data.get("token") or data.get("accessToken") or data.get("jwt") or data.get("jwToken")
-            
-            if not token:
-                 print(f"[ERROR] Login Response missing token: {data}", file=sys.stderr)
-                 return None
-                 
-            return token
-
-        except Exception as e:
-            print(f"[ERROR] Login Failed: {e}", file=sys.stderr)
+        
+        data = response.json()
+        # Try common token keys
+        token = data.get("token") or data.get("accessToken") or data.get("jwt") or data.get("jwToken")
+        
+        if not token:
+             print(f"[ERROR] Login Response missing token: {data}", file=sys.stderr)
+             return None
+             
+        return token
+
+    except Exception as e:
+        print(f"[ERROR] Login Failed: {e}", file=sys.stderr)
+        return None
+
+def decode_jwt_expiry(token: str) -> Optional[float]:
+    """
+    Reads the `exp` claim (epoch seconds) from a JWT without verifying it.
+    Returns None if the token is not a JWT or has no exp.
+    """
+    try:
+        payload_b64 = token.split(".")[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload_b64))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+class TokenManager:
+    """
+    Caches the API token and refreshes it before it expires.
+
+    - Expiry comes from the JWT `exp` claim, else the configured TTL.
+    - Refresh happens `refresh_skew` seconds early so callers never send a dying token.
+    - Concurrent callers share ONE in-flight login.
+    - `invalidate(token)` (e.g. after a 401) only drops the token if it is still current,
+      so a burst of 401s triggers a single re-login.
+    """
+
+    def __init__(self, login_fn=login_and_get_token, default_ttl: float = TOKEN_TTL_SECONDS, refresh_skew: float = TOKEN_REFRESH_SKEW_SECONDS):
+        self._login_fn = login_fn
+        self.default_ttl = default_ttl
+        self.refresh_skew = refresh_skew
+        self._token: Optional[str] = None
+        self._refresh_at: float = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self.logins = 0
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.time() < self._refresh_at
+
+    async def _refresh(self) -> Optional[str]:
+        self.logins += 1
+        token = await self._login_fn()
+        if not token:
             return None
+        now = time.time()
+        expires_at = decode_jwt_expiry(token) or (now + self.default_ttl)
+        # Short-lived tokens: never let the skew eat more than half the lifetime
+        skew = min(self.refresh_skew, max(expires_at - now, 0) / 2)
+        self._token = token
+        self._refresh_at = expires_at - skew
+        return token
+
+    async def get_token(self) -> Optional[str]:
+        if self._is_fresh():
+            return self._token
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._inflight)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        if token is None or token == self._token:
+            self._token = None
+            self._refresh_at = 0.0
+
+# Process-wide token cache used by the quote tools
+token_manager = TokenManager()
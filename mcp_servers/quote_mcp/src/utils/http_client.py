@@ -0,0 +1,43 @@
+import sys
+import httpx
+import importlib.util
+from typing import Optional
+from ..config.config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY,
+    HTTP_ENABLE_HTTP2, HTTP_CONNECT_TIMEOUT
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+def _http2_available() -> bool:
+    if not HTTP_ENABLE_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        print("[WARNING] QUOTE_HTTP2 is enabled but 'h2' is not installed. Falling back to HTTP/1.1.", file=sys.stderr)
+        return False
+    return True
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-level pooled client shared by auth and quote calls.
+    Keep-alive connections are reused, so only the first call pays for TCP/TLS setup.
+    Per-operation timeouts are passed on each request.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(30.0, connect=HTTP_CONNECT_TIMEOUT),
+            http2=_http2_available(),
+        )
+    return _client
+
+async def aclose_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
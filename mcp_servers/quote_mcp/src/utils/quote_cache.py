@@ -0,0 +1,136 @@
+import sys
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from ..config.config import QUOTE_CACHE_ENABLED, QUOTE_CACHE_TTL_SECONDS, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_SQLITE_PATH
+
+def canonicalize_payload(payload: dict) -> str:
+    """Key order / whitespace independent representation of a GetPrice2 payload."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def payload_hash(payload: dict) -> str:
+    return hashlib.sha256(canonicalize_payload(payload).encode("utf-8")).hexdigest()
+
+def is_error_result(result: str) -> bool:
+    """Our own failures and non-2xx upstream responses both use the {"error": ...} envelope."""
+    try:
+        data = json.loads(result)
+    except Exception:
+        return True
+    return isinstance(data, dict) and "error" in data
+
+def is_cacheable(result: str, status: int) -> bool:
+    """Only successful (2xx) upstream responses are cached."""
+    return 200 <= status < 300 and not is_error_result(result)
+
+class _SqliteTier:
+    """Optional on-disk tier so repeat quotes survive server restarts."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quote_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM quote_cache WHERE key = ?", (key,)).fetchone()
+        if row and row[1] > time.time():
+            return row[0], row[1]
+        return None
+
+    def put(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quote_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at)
+            )
+            self._conn.execute("DELETE FROM quote_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+class QuoteCache:
+    """
+    Content-addressed cache for GetPrice2 responses.
+
+    - Key: sha256 of the canonicalized payload.
+    - Tier 1: bounded in-memory LRU with TTL. Tier 2 (optional): SQLite file.
+    - Concurrent identical requests are coalesced into ONE upstream call.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300, sqlite_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._disk = _SqliteTier(sqlite_path) if sqlite_path else None
+        self.stats = {"hit": 0, "disk_hit": 0, "coalesced": 0, "miss": 0}
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key: str, value: str, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _fetch_and_store(self, key: str, payload: dict, fetch_fn) -> str:
+        result, status = await fetch_fn(payload)
+        if is_cacheable(result, status):
+            expires_at = time.time() + self.ttl_seconds
+            self._memory_put(key, result, expires_at)
+            if self._disk:
+                try:
+                    await asyncio.to_thread(self._disk.put, key, result, expires_at)
+                except Exception as e:
+                    print(f"[WARNING] Quote disk cache write failed: {e}", file=sys.stderr)
+        return result
+
+    async def get_or_fetch(self, payload: dict, fetch_fn: Callable[[dict], Awaitable[Tuple[str, int]]]) -> Tuple[str, str]:
+        """Returns (result_json, cache_status) where status is hit|disk_hit|coalesced|miss."""
+        key = payload_hash(payload)
+
+        cached = self._memory_get(key)
+        if cached is not None:
+            self.stats["hit"] += 1
+            return cached, "hit"
+
+        if self._disk:
+            try:
+                row = await asyncio.to_thread(self._disk.get, key)
+            except Exception as e:
+                print(f"[WARNING] Quote disk cache read failed: {e}", file=sys.stderr)
+                row = None
+            if row:
+                self._memory_put(key, row[0], row[1])
+                self.stats["disk_hit"] += 1
+                return row[0], "disk_hit"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(task), "coalesced"
+
+        task = asyncio.create_task(self._fetch_and_store(key, payload, fetch_fn))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        self.stats["miss"] += 1
+        return await asyncio.shield(task), "miss"
+
+# Process-wide cache (None when disabled)
+quote_cache = QuoteCache(QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_TTL_SECONDS, QUOTE_CACHE_SQLITE_PATH) if QUOTE_CACHE_ENABLED else None
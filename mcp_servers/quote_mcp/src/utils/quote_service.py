@@ -1,36 +1,59 @@
 import httpx
 import sys
 import json
-from ..config.config import GET_PRICE_API
-from .auth_service import login_and_get_token
+from typing import Tuple
+from ..config.config import GET_PRICE_API, QUOTE_TIMEOUT
+from .auth_service import token_manager
+from .http_client import get_http_client
+from .tracing import CLIENT, span
 
-async def fetch_quote_from_api(payload: dict) -> str:
+async def fetch_quote_from_api(payload: dict) -> Tuple[str, int]:
     """
     Authenticates and sends the quote payload to the API.
-    Returns JSON string.
+    Returns (JSON string, upstream HTTP status); the status is 0 when no response
+    was received. Non-2xx responses are wrapped in the {"error": ...} envelope.
     """
-    # 1. Login
-    token = await login_and_get_token()
+    # 1. Login (cached token, refreshed before expiry)
+    token = await token_manager.get_token()
     if not token:
-        return json.dumps({"error": "Could not authenticate with Quote Service."})
+        return json.dumps({"error": "Could not authenticate with Quote Service."}), 0
 
-    # 2. Setup Request
+    # 2. Send (one forced re-login + retry if the token was rejected)
+    client = get_http_client()
+    try:
+        response = await _post_quote(client, payload, token)
+
+        if response.status_code == 401:
+            print("[WARNING] Token rejected (401). Re-authenticating once.", file=sys.stderr)
+            token_manager.invalidate(token)
+            token = await token_manager.get_token()
+            if not token:
+                return json.dumps({"error": "Could not authenticate with Quote Service."}), 0
+            response = await _post_quote(client, payload, token)
+        
+        try:
+            data = response.json()
+        except:
+            return json.dumps({"error": "Failed to parse API response", "status": response.status_code, "raw_text": response.text}), response.status_code
+
+        if not response.is_success:
+            print(f"[ERROR] Quote API returned HTTP {response.status_code}", file=sys.stderr)
+            return json.dumps({"error": f"Quote API returned HTTP {response.status_code}", "status": response.status_code, "details": data}, indent=2), response.status_code
+        return json.dumps(data, indent=2), response.status_code
+
+    except Exception as e:
+        print(f"[ERROR] Quote Request Failed: {e}", file=sys.stderr)
+        return json.dumps({"error": f"System Error: {str(e)}"}), 0
+
+async def _post_quote(client: httpx.AsyncClient, payload: dict, token: str) -> httpx.Response:
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
-    
-    # 3. Send
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(GET_PRICE_API, json=payload, headers=headers, timeout=30.0)
-            
-            try:
-                data = response.json()
-                return json.dumps(data, indent=2)
-            except:
-                return json.dumps({"error": "Failed to parse API response", "raw_text": response.text})
-
-        except Exception as e:
-            print(f"[ERROR] Quote Request Failed: {e}", file=sys.stderr)
-            return json.dumps({"error": f"System Error: {str(e)}"})
+    with span("POST GetPrice2", CLIENT, {"http.request.method": "POST", "url.full": GET_PRICE_API}) as attrs:
+        response = await client.post(GET_PRICE_API, json=payload, headers=headers, timeout=QUOTE_TIMEOUT)
+        if attrs is not None:
+            attrs["http.response.status_code"] = response.status_code
+            if response.status_code >= 400:
+                attrs["error"] = f"HTTP {response.status_code}"
+        return response
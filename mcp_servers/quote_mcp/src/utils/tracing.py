@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from ..config.config import TRACE_ENABLED, TRACE_EXPORT_PATH, TRACE_SERVICE_NAME
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+_current: contextvars.ContextVar = contextvars.ContextVar("quote_mcp_span", default=None)
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """'00-<trace_id>-<span_id>-<flags>' -> (trace_id, span_id) if sampled and well-formed."""
+    parts = (header or "").strip().lower().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = int(parts[3], 16) & 1
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return (parts[1], parts[2]) if sampled else None
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+class _FileExporter:
+    """
+    Appends OTLP/JSON lines to the file the agent writes to (TRACE_EXPORT_PATH),
+    one O_APPEND write per batch, from a background thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        self._queue.put(span)
+
+    def _write(self, spans: List[Dict[str, Any]]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": "quote_mcp"}, "spans": spans}],
+            }]
+        }
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, (json.dumps(request, default=str) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item] if item is not None else []
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError as e:
+                    print(f"[WARNING] Trace export failed ({len(batch)} spans dropped): {e}", file=sys.stderr)
+            if item is None:
+                return
+
+    def shutdown(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+_exporter = _FileExporter(TRACE_EXPORT_PATH) if TRACE_ENABLED else None
+
+@contextmanager
+def span(name: str, kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None, traceparent: Optional[str] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Records a span under the current one, or under the agent's span passed as
+    `traceparent` (request _meta). Without either, nothing is recorded: the
+    server only traces work the agent asked it to trace.
+    Yields the span's attribute dict (None when not recording).
+    """
+    parent = _current.get()
+    remote = None if parent or _exporter is None else parse_traceparent(traceparent)
+    if _exporter is None or not (parent or remote):
+        yield None
+        return
+
+    trace_id, parent_id = (parent["traceId"], parent["spanId"]) if parent else remote
+    current = {"traceId": trace_id, "spanId": secrets.token_hex(8), "parentSpanId": parent_id}
+    attrs = dict(attributes or {})
+    token = _current.set(current)
+    start = time.time_ns()
+    status = {"code": 1}
+    try:
+        yield attrs
+    except BaseException as e:
+        status = {"code": 2, "message": f"{type(e).__name__}: {e}"}
+        raise
+    finally:
+        _current.reset(token)
+        if "error" in attrs:
+            status = {"code": 2, "message": str(attrs.pop("error"))}
+        _exporter.export({
+            **current,
+            "name": name,
+            "kind": kind,
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(time.time_ns()),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attrs.items()],
+            "status": status,
+        })
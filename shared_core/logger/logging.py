@@ -1,6 +1,13 @@
 import os
 import sys
+import json
+import queue
+import atexit
+import random
 import logging
+import contextvars
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from dotenv import load_dotenv, find_dotenv
 
 logging_str = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
 
@@ -8,15 +15,117 @@ log_dir = "logs"
 log_filepath = os.path.join(log_dir,"running_logs.log")
 os.makedirs(log_dir, exist_ok=True)
 
+# --- Settings (env; imported before the apps load .env themselves) ---
+load_dotenv(find_dotenv())
+LOG_LEVEL = os.getenv("LOG_LEVEL") or "INFO"
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES") or 10 * 1024 * 1024)
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT") or 5)
+# e.g. "httpx=0.1,model_router=0.5" (only records below WARNING are sampled)
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES") or ""
+LOG_CONSOLE_JSON = (os.getenv("LOG_CONSOLE_JSON") or "false").lower() == "true"
 
-logging.basicConfig(
-    level= logging.INFO,
-    format= logging_str,
+# --- Request context (set by the API middleware/endpoints, inherited by tasks) ---
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+thread_id_var: contextvars.ContextVar = contextvars.ContextVar("thread_id", default=None)
+
+
+def bind_log_context(request_id=None, thread_id=None) -> None:
+    """Tags every record logged from this context (and tasks it creates)."""
+    if request_id is not None:
+        request_id_var.set(request_id)
+    if thread_id is not None:
+        thread_id_var.set(thread_id)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the context variables onto the record in the caller's thread."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.thread_id = thread_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of sub-WARNING records per logger name (longest prefix wins)
+    or per module (our nodes all log through "agent_app").
+    """
+
+    def __init__(self, rates: str):
+        super().__init__()
+        self.rates = {}
+        for part in rates.split(","):
+            name, _, rate = part.partition("=")
+            if name.strip() and rate.strip():
+                self.rates[name.strip()] = float(rate)
+
+    def filter(self, record):
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        if record.module in self.rates:
+            return random.random() < self.rates[record.module]
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "thread_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
 
-    handlers=[
-        logging.FileHandler(log_filepath),
-        logging.StreamHandler(sys.stdout)
-    ]
+
+class ContextTextFormatter(logging.Formatter):
+    """The classic text line, with request/thread ids appended when present."""
+
+    def format(self, record):
+        line = super().format(record)
+        tags = [f"{key}={getattr(record, key)}" for key in ("request_id", "thread_id") if getattr(record, key, None)]
+        return f"{line} {' '.join(tags)}" if tags else line
+
+
+# Handlers run on the listener's thread: disk/console stalls never block the event loop
+file_handler = RotatingFileHandler(log_filepath, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+file_handler.setFormatter(JsonFormatter())
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(JsonFormatter() if LOG_CONSOLE_JSON else ContextTextFormatter(logging_str))
+
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+# prepare() bakes the message (and traceback) into the record before it crosses threads
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+queue_handler.addFilter(ContextFilter())
+queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+
+listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+listener.start()
+
+
+@atexit.register
+def _flush_logs() -> None:
+    if listener._thread is not None:
+        listener.stop()
+
+
+logging.basicConfig(
+    level= LOG_LEVEL,
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger("agent_app")